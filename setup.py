@@ -12,10 +12,11 @@ setup(
     author='Alexander Ross',
     author_email='alex@ross.vip',
     license='GPL v3',
-    packages=['sifr'],
+    packages=['sifr', 'sifr.bench'],
     python_requires=">=3.7",  # Need to verify with earlier versions
     install_requires=['logging',
                       ],
+    extras_require={'numpy': ['numpy']},
 
     classifiers=[
         "Programming Language :: Python :: 3",
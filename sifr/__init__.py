@@ -21,3 +21,4 @@ ___date__ = "22 February 2024"
 from sifr.systems import SifrSystem
 from sifr.sifr import Sifr
 from sifr.xuarizm import Xuarizm
+from sifr.arrays import SifrArray
@@ -0,0 +1,277 @@
+# #############################################################################
+# SIFRARRAY
+# #############################################################################
+# Container for a column of numbers in one SifrSystem so the arithmetic can be
+# done on the whole column at once rather than one Sifr object at a time.
+# Every number is held as a signed integer mantissa over one shared number of
+# xcimal places (the exponent), so adding, subtracting and comparing are done
+# on the mantissas directly and multiplying and dividing only need the one
+# rounding step per element that the SifrSystem uses for a single Sifr. The
+# results are therefore the same as doing the operations Sifr by Sifr.
+# The mantissas are held in a NumPy object array where NumPy is installed and
+# a plain list otherwise. With NumPy, adding, subtracting and comparing loop
+# in C (still calling the Python integer operations on each element) and
+# broadcast, while multiplying and dividing, which round each element, call a
+# Python function per element through np.frompyfunc.
+# #############################################################################
+
+import logging
+import operator
+
+from sifr.systems import SifrScopeException
+from sifr.sifr import Sifr
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Column helpers (NumPy object array or list of mantissas)
+_NATIVE_OPERATORS = (operator.add, operator.sub, operator.mul, operator.eq,
+                     operator.ne, operator.gt, operator.lt, operator.ge,
+                     operator.le)
+
+
+def _column(mants):
+    if np is None:
+        return list(mants)
+    column = np.empty(len(mants), dtype=object)
+    column[:] = list(mants)
+    return column
+
+
+def _elementwise(func, col1, col2):
+    '''Applies func to each pair of mantissas, where col2 can also be a
+    single mantissa that is broadcast across col1'''
+    if np is not None:
+        if func in _NATIVE_OPERATORS:
+            return func(col1, col2)
+        return np.frompyfunc(func, 2, 1)(col1, col2)
+    if isinstance(col2, list):
+        return [func(m1, m2) for m1, m2 in zip(col1, col2)]
+    return [func(m1, col2) for m1 in col1]
+
+
+class SifrArray(object):
+    '''A one dimensional array of numbers in the one SifrSystem, taking an
+    iterable of Sifrs (or sifr strings) and the system'''
+    __slots__ = ('ssys', '_mants', '_exp')
+
+    def __init__(self, sifrs, sifr_system):
+        self.ssys = sifr_system
+        nums = []
+        for sifr in sifrs:
+            if isinstance(sifr, Sifr):
+                if sifr.ssys != sifr_system:
+                    raise Exception("Sifr Systems do not match")
+                nums.append((sifr._signed(), sifr._exp))
+            else:
+                is_neg, mant, exp = sifr_system._to_num(sifr)
+                nums.append((-mant if is_neg else mant, exp))
+        self._exp = max((exp for _, exp in nums), default=0)
+        self._mants = _column(
+            [mant * sifr_system.base_no**(self._exp - exp)
+             for mant, exp in nums])
+
+    @classmethod
+    def _from_num(cls, mants, exp, sifr_system):
+        '''Instantiates a SifrArray directly from a column of signed
+        mantissas sharing the exponent exp'''
+        result = cls.__new__(cls)
+        result.ssys = sifr_system
+        result._mants = mants
+        result._exp = exp
+        return result
+
+    def _sifr_at(self, mant):
+        return Sifr._from_num(mant < 0, abs(mant), self._exp, self.ssys)
+
+    def _operands(self, other):
+        '''Mantissas of both operands scaled to the same exponent, where
+        other is a SifrArray of the same length or a single Sifr (or int)
+        Returns: [mantissas 1, mantissas 2, exponent]'''
+        if isinstance(other, int):
+            other = self.ssys.from_int(other)
+        if self.ssys != other.ssys:
+            raise Exception("Sifr Systems do not match")
+        if isinstance(other, SifrArray):
+            if len(self) != len(other):
+                raise Exception("SifrArrays are not the same length")
+            mants = other._mants
+        else:
+            mants = other._signed()
+        exp = max(self._exp, other._exp)
+        base = self.ssys.base_no
+        mants1 = self._mants
+        if exp > self._exp:
+            mants1 = _elementwise(operator.mul, mants1,
+                                  base**(exp - self._exp))
+        if exp > other._exp:
+            scale = base**(exp - other._exp)
+            if isinstance(other, SifrArray):
+                mants = _elementwise(operator.mul, mants, scale)
+            else:
+                mants *= scale
+        return mants1, mants, exp
+
+    def _broadcast(self, other):
+        '''SifrArray of a single Sifr (or int) repeated to the length of
+        this one'''
+        if isinstance(other, int):
+            other = self.ssys.from_int(other)
+        return SifrArray([other] * len(self), self.ssys)
+
+    def _operate(self, name, func, other):
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### START ARRAY " + name)
+        mants1, mants2, exp = self._operands(other)
+        result = func(mants1, mants2, exp)
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### END ARRAY " + name)
+        return result
+
+    # REPRESENTATIONAL DUNDERS
+    def __repr__(self):
+        return '[' + ', '.join(sifr.sifr for sifr in self) + ']'
+
+    # CONTAINER DUNDERS
+    def __len__(self):
+        return len(self._mants)
+
+    def __iter__(self):
+        for mant in self._mants:
+            yield self._sifr_at(mant)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SifrArray._from_num(_column(self._mants[index]), self._exp,
+                                       self.ssys)
+        return self._sifr_at(self._mants[index])
+
+    def tolist(self):
+        return list(self)
+
+    # UNARY MAGNITUDE OPERATOR DUNDERS
+    def __abs__(self):
+        mants = _column([abs(mant) for mant in self._mants])
+        return SifrArray._from_num(mants, self._exp, self.ssys)
+
+    def __neg__(self):
+        mants = _column([-mant for mant in self._mants])
+        return SifrArray._from_num(mants, self._exp, self.ssys)
+
+    def __pos__(self):
+        return SifrArray._from_num(_column(self._mants), self._exp, self.ssys)
+
+    # ARITHMETIC DUNDERS
+    def __add__(self, add_no):
+        def add(mants1, mants2, exp):
+            return SifrArray._from_num(
+                _elementwise(operator.add, mants1, mants2), exp, self.ssys)
+        return self._operate("ADD", add, add_no)
+
+    def __sub__(self, sub_no):
+        def sub(mants1, mants2, exp):
+            return SifrArray._from_num(
+                _elementwise(operator.sub, mants1, mants2), exp, self.ssys)
+        return self._operate("SUB", sub, sub_no)
+
+    def __mul__(self, mul_no):
+        ssys = self.ssys
+
+        def mul(mants1, mants2, exp):
+            # Each product is rounded as _num_mul rounds a single one
+            places = min(2*exp, ssys.xcimal_places)
+
+            def round_product(m1, m2):
+                mant = m1 * m2
+                rounded, _ = ssys._num_round(abs(mant), 2*exp, places)
+                return -rounded if mant < 0 else rounded
+            return SifrArray._from_num(
+                _elementwise(round_product, mants1, mants2), places, ssys)
+        return self._operate("MULT", mul, mul_no)
+
+    def __truediv__(self, div_no):
+        ssys = self.ssys
+
+        def div(mants1, mants2, exp):
+            # With the exponents the same, each quotient is the ratio of the
+            # mantissas divided and rounded as _num_div would
+            places = ssys.xcimal_places + 1
+            scale = ssys.base_no**places
+
+            def round_quotient(m1, m2):
+                if m2 == 0:
+                    raise SifrScopeException("Zero Division Error")
+                quot, _ = ssys._int_divmod(abs(m1) * scale, abs(m2))
+                quot, _ = ssys._num_round(quot, places, ssys.xcimal_places)
+                return -quot if (m1 < 0) != (m2 < 0) else quot
+            return SifrArray._from_num(
+                _elementwise(round_quotient, mants1, mants2),
+                ssys.xcimal_places, ssys)
+        return self._operate("DIV", div, div_no)
+
+    # REFLECTED ARITHMETIC DUNDERS (a Sifr or int on the left)
+    def __radd__(self, add_no):
+        return self.__add__(add_no)
+
+    def __rsub__(self, sub_no):
+        return self._broadcast(sub_no) - self
+
+    def __rmul__(self, mul_no):
+        return self.__mul__(mul_no)
+
+    def __rtruediv__(self, div_no):
+        return self._broadcast(div_no) / self
+
+    # RELATIONAL DUNDERS (elementwise, giving an array or list of bools)
+    def _compare(self, name, func, d):
+        return self._operate(
+            name, lambda m1, m2, _: _elementwise(func, m1, m2), d)
+
+    def __eq__(self, d):
+        return self._compare("EQUAL", operator.eq, d)
+
+    def __ne__(self, d):
+        return self._compare("NOT EQUAL", operator.ne, d)
+
+    def __gt__(self, d):
+        return self._compare("GREATER THAN", operator.gt, d)
+
+    def __lt__(self, d):
+        return self._compare("LESS THAN", operator.lt, d)
+
+    def __ge__(self, d):
+        return self._compare("GREATER THAN OR EQUAL TO", operator.ge, d)
+
+    def __le__(self, d):
+        return self._compare("LESS THAN OR EQUAL TO", operator.le, d)
+
+    __hash__ = None
+
+    # Reductions
+    def sum(self):
+        '''Sum of the numbers (exact, as adding Sifrs is)'''
+        total = sum(self._mants)
+        return Sifr._from_num(total < 0, abs(total), self._exp, self.ssys)
+
+    def prod(self):
+        '''Product of the numbers, rounded after each multiplication in turn
+        as multiplying the Sifrs one after another would be'''
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### START ARRAY PRODUCT")
+        if len(self) == 0:
+            return self.ssys.one
+        is_neg = False
+        mant, exp = 0, self._exp
+        for pos, elem in enumerate(self._mants):
+            is_neg = is_neg != (elem < 0)
+            if pos == 0:
+                mant = abs(elem)
+            else:
+                mant, exp = self.ssys._num_mul(mant, exp, abs(elem),
+                                               self._exp)
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### END ARRAY PRODUCT")
+        return Sifr._from_num(is_neg, mant, exp, self.ssys)
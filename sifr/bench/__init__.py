@@ -0,0 +1,12 @@
+# #############################################################################
+# SIFR BENCHMARKS
+# #############################################################################
+# Benchmarks of the arithmetic and Constants of Sifr across operand sizes and
+# bases, written out as JSON and checked against an earlier run for
+# operations that have come to scale worse. Run as:
+#     python -m sifr.bench --output results.json --baseline previous.json
+# #############################################################################
+
+from sifr.bench.suite import (OPERATIONS, DEFAULT_SIZES, DEFAULT_BASES,
+                              DEFAULT_TOLERANCE, alphabet, run, fit_exponent,
+                              exponents, compare)
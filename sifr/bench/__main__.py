@@ -0,0 +1,75 @@
+# #############################################################################
+# SIFR BENCHMARKS (COMMAND LINE)
+# #############################################################################
+# Runs the benchmark suite, prints each timing and the fitted exponents, writes
+# the results as JSON and exits with status 1 if any exponent has risen past
+# the tolerance since the baseline given.
+# #############################################################################
+
+import argparse
+import json
+import sys
+
+from sifr.bench import suite
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sifr.bench',
+        description='Benchmarks Sifr operations across sizes and bases')
+    parser.add_argument('--operations', nargs='+', choices=suite.OPERATIONS,
+                        help='operations to time (default all)')
+    parser.add_argument('--sizes', nargs='+', type=int,
+                        default=suite.DEFAULT_SIZES,
+                        help='operand sizes in digits')
+    parser.add_argument('--bases', nargs='+', type=int,
+                        default=suite.DEFAULT_BASES, help='bases to time in')
+    parser.add_argument('--min-time', type=float, default=0.05,
+                        help='least seconds each timing run takes')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='timing runs of which the fastest is kept')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed of the random operands')
+    parser.add_argument('--output',
+                        help='file the JSON results are written to')
+    parser.add_argument('--baseline',
+                        help='JSON results of an earlier run to compare with')
+    parser.add_argument('--tolerance', type=float,
+                        default=suite.DEFAULT_TOLERANCE,
+                        help='rise in growth exponent taken as a regression')
+    args = parser.parse_args(argv)
+
+    def progress(result):
+        print('{operation:>8} base {base:<5} {digits:>7} digits '
+              '{seconds:.3e} s'.format(**result), flush=True)
+
+    results = suite.run(args.operations, args.sizes, args.bases,
+                        args.min_time, args.repeat, args.seed, progress)
+
+    print('')
+    print('Growth exponents (seconds ~ digits^k):')
+    for key, exponent in sorted(results['exponents'].items()):
+        print('{:>16} {}'.format(
+            key, 'n/a' if exponent is None else '{:.2f}'.format(exponent)))
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = suite.compare(results, baseline, args.tolerance)
+        print('')
+        if not regressions:
+            print('No regressions against ' + args.baseline)
+            return 0
+        for regression in regressions:
+            print('REGRESSION {key}: exponent {exponent:.2f} against '
+                  '{baseline:.2f} (+{rise:.2f})'.format(**regression))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,183 @@
+# #############################################################################
+# BENCHMARK SUITE
+# #############################################################################
+# Times the arithmetic of Sifrs (add, sub, mul, div, pow, compare and round)
+# and the Constants routines across operand sizes and bases, and fits the
+# growth exponent of each operation in each base (the slope of log time
+# against log digits) so a change in how an operation scales shows up
+# whatever machine the benchmark is run on.
+# Results are plain dictionaries so they can be written out as JSON and
+# compared with the results of an earlier run.
+# #############################################################################
+
+import math
+import platform
+import random
+import string
+import time
+import timeit
+
+import sifr
+from sifr.systems import SifrSystem
+from sifr.sifr import Sifr
+from sifr.xuarizm import Constants
+
+DEFAULT_SIZES = (10, 100, 1000, 10000, 100000)
+DEFAULT_BASES = (2, 10, 16, 64, 1024)
+
+# How far an exponent can grow past the one it is compared with before it is
+# taken to be a regression
+DEFAULT_TOLERANCE = 0.25
+
+
+def alphabet(base):
+    '''Digit list of the given base: 0-9, A-Z, a-z, + and / up to base 64
+    (so base 16 is the usual hexadecimal) and CJK characters past it'''
+    if base <= 64:
+        return (string.digits + string.ascii_uppercase +
+                string.ascii_lowercase + '+/')[:base]
+    return ''.join(chr(0x4E00 + pos) for pos in range(base))
+
+
+def _operand(ssys, digits, rand):
+    '''Sifr with digits random digits, half before the radix and half after
+    (so the xcimal places of the system hold all of it)'''
+    whole = max(digits - digits // 2, 1)
+    symbols = [rand.choice(ssys.digit_list[1:])] + \
+        [rand.choice(ssys.digit_list) for _ in range(digits - 1)]
+    return Sifr(''.join(symbols[:whole]) + ssys.radix +
+                ''.join(symbols[whole:] or ssys.iden), ssys)
+
+
+# Each case takes the system, the operands and the size and gives back the
+# function that is timed
+def _add(ssys, x, y, digits):
+    return lambda: x + y
+
+
+def _sub(ssys, x, y, digits):
+    return lambda: x - y
+
+
+def _mul(ssys, x, y, digits):
+    return lambda: x * y
+
+
+def _div(ssys, x, y, digits):
+    return lambda: x / y
+
+
+def _pow(ssys, x, y, digits):
+    three = ssys.from_int(3)
+    return lambda: x ** three
+
+
+def _compare(ssys, x, y, digits):
+    return lambda: x < y
+
+
+def _round(ssys, x, y, digits):
+    return lambda: x.round(digits // 4)
+
+
+def _constant(method):
+    def case(ssys, x, y, digits):
+        return lambda: getattr(Constants(ssys, cache=None), method)()
+    return case
+
+
+OPERATIONS = {'add': _add,
+              'sub': _sub,
+              'mul': _mul,
+              'div': _div,
+              'pow': _pow,
+              'compare': _compare,
+              'round': _round,
+              'pi': _constant('return_pi'),
+              'e': _constant('return_e'),
+              'phi': _constant('return_phi')}
+
+
+def _time(func, min_time, repeat):
+    '''Fastest time of one call of func, from repeat runs of as many calls
+    as take at least min_time'''
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        if timer.timeit(number) >= min_time:
+            break
+        number *= 10
+    return min(timer.repeat(repeat, number)) / number
+
+
+def run(operations=None, sizes=DEFAULT_SIZES, bases=DEFAULT_BASES,
+        min_time=0.05, repeat=3, seed=0, progress=None):
+    '''Times each operation (names from OPERATIONS) with operands of each
+    size in digits, in each base. progress (if given) is called with each
+    result as it comes in
+    Returns: dictionary of the setup, the results and the fitted exponents'''
+    operations = list(OPERATIONS) if operations is None else operations
+    rand = random.Random(seed)
+    results = []
+    for base in bases:
+        for digits in sizes:
+            ssys = SifrSystem(alphabet(base), xcimal_places=digits)
+            x, y = _operand(ssys, digits, rand), _operand(ssys, digits, rand)
+            for name in operations:
+                func = OPERATIONS[name](ssys, x, y, digits)
+                result = {'operation': name, 'base': base, 'digits': digits,
+                          'seconds': _time(func, min_time, repeat)}
+                results.append(result)
+                if progress is not None:
+                    progress(result)
+    return {'sifr_version': sifr.__version__,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'min_time': min_time,
+            'results': results,
+            'exponents': exponents(results)}
+
+
+def fit_exponent(sizes, seconds):
+    '''Least squares slope of log(seconds) against log(sizes), i.e. k in
+    seconds ~ sizes^k (None with fewer than two sizes)'''
+    points = [(math.log(size), math.log(secs))
+              for size, secs in zip(sizes, seconds) if secs > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x)**2 for x, _ in points)
+    if var_x == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+
+
+def exponents(results):
+    '''Growth exponent of each operation in each base, keyed
+    "operation/base"'''
+    series = {}
+    for result in results:
+        key = result['operation'] + '/' + str(result['base'])
+        series.setdefault(key, []).append((result['digits'],
+                                           result['seconds']))
+    return {key: fit_exponent([size for size, _ in points],
+                              [secs for _, secs in points])
+            for key, points in series.items()}
+
+
+def compare(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    '''Operations whose growth exponent has risen by more than tolerance
+    since the baseline (both results as given by run)
+    Returns: list of dictionaries of the key, both exponents and the rise'''
+    regressions = []
+    for key, exponent in sorted(current['exponents'].items()):
+        before = baseline['exponents'].get(key)
+        if exponent is None or before is None:
+            continue
+        if exponent - before > tolerance:
+            regressions.append({'key': key, 'exponent': exponent,
+                                'baseline': before,
+                                'rise': exponent - before})
+    return regressions
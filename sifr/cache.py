@@ -0,0 +1,216 @@
+# #############################################################################
+# CONSTANT CACHE
+# #############################################################################
+# Cache of computed constants (such as pi and e) so they are only worked out
+# once per numbering system and precision. Values are kept in numeric form
+# (sign, integer mantissa and number of xcimal places), keyed by the name of
+# the constant, the digit list of the system and the xcimal places they were
+# worked out to, in memory with least recently used eviction and optionally
+# on disk so they outlive the process.
+# A value can be served for any precision up to the one it was worked out to,
+# as the caller rounds it down to the precision it needs.
+# On disk each value is one file holding a small header and the mantissa as
+# little endian bytes, which is read back through a memory map.
+# Also holds the memo used (when switched on) for results of exponentiation
+# and the Formulae, bounded by the memory its entries take up.
+# #############################################################################
+
+import collections
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import threading
+
+# Magic, version, negative flag, xcimal places and mantissa length in bytes
+_HEADER = struct.Struct('<4sBBQQ')
+_MAGIC = b'SIFR'
+# Version 2 holds working values truncated, rather than rounded, to their
+# xcimal places
+_VERSION = 2
+
+
+class ConstantCache(object):
+    '''Least recently used cache of up to maxsize constants, also written to
+    (and read from) the directory path if one is given'''
+    def __init__(self, maxsize=32, path=None):
+        self.maxsize = maxsize
+        self.path = path
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    def get(self, name, digit_list, xcimal_places):
+        '''Numeric form (is_neg, mantissa, exponent) of the constant worked
+        out to at least the given xcimal places, or None if it isn't held'''
+        with self._lock:
+            best = None
+            for key in self._entries:
+                if key[:2] == (name, digit_list) and \
+                        key[2] >= xcimal_places and \
+                        (best is None or key[2] < best[2]):
+                    best = key
+            if best is not None:
+                self._entries.move_to_end(best)
+                return self._entries[best]
+
+        loaded = self._load(name, digit_list, xcimal_places)
+        if loaded is None:
+            return None
+        # Held under the precision it was worked out to, so it can be served
+        # again for any precision up to that
+        places, num = loaded
+        self._store(name, digit_list, places, num)
+        return num
+
+    def put(self, name, digit_list, xcimal_places, num):
+        '''Holds the numeric form of a constant worked out to the given
+        xcimal places'''
+        self._store(name, digit_list, xcimal_places, num)
+        if self.path is not None:
+            self._write(name, digit_list, xcimal_places, num)
+
+    def clear(self):
+        '''Empties the cache in memory (files on disk are kept)'''
+        with self._lock:
+            self._entries.clear()
+
+    def _store(self, name, digit_list, xcimal_places, num):
+        with self._lock:
+            key = (name, digit_list, xcimal_places)
+            self._entries[key] = num
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    # On disk
+    def _file_prefix(self, name, digit_list):
+        digest = hashlib.sha1(digit_list.encode('utf-8')).hexdigest()[:16]
+        return name + '_' + digest + '_'
+
+    def _write(self, name, digit_list, xcimal_places, num):
+        is_neg, mant, exp = num
+        mant_bytes = mant.to_bytes((mant.bit_length() + 7) // 8, 'little')
+        file_name = os.path.join(self.path,
+                                 self._file_prefix(name, digit_list) +
+                                 str(xcimal_places) + '.bin')
+        # Written to the side and moved in so a reader never sees half a file
+        temp_name = file_name + '.' + str(os.getpid()) + '.tmp'
+        with open(temp_name, 'wb') as cache_file:
+            cache_file.write(_HEADER.pack(_MAGIC, _VERSION, is_neg, exp,
+                                          len(mant_bytes)))
+            cache_file.write(mant_bytes)
+        os.replace(temp_name, file_name)
+
+    def _load(self, name, digit_list, xcimal_places):
+        '''Reads the file of the lowest precision on disk that is at least
+        the given xcimal places. A file that can't be read (empty, cut short
+        or not a cache file) is removed and the next one tried
+        Returns: [xcimal places, numeric form] or None'''
+        if self.path is None:
+            return None
+        prefix = self._file_prefix(name, digit_list)
+        best = None
+        for file_name in os.listdir(self.path):
+            places = file_name[len(prefix):-len('.bin')]
+            if file_name.startswith(prefix) and file_name.endswith('.bin') \
+                    and places.isdigit() and int(places) >= xcimal_places \
+                    and (best is None or int(places) < best):
+                best = int(places)
+        if best is None:
+            return None
+
+        file_name = os.path.join(self.path, prefix + str(best) + '.bin')
+        num = self._read(file_name)
+        if num is None:
+            try:
+                os.remove(file_name)
+            except OSError:
+                return None
+            return self._load(name, digit_list, xcimal_places)
+        return best, num
+
+    @staticmethod
+    def _read(file_name):
+        '''Numeric form held in a cache file, or None if it isn't a whole
+        cache file'''
+        try:
+            with open(file_name, 'rb') as cache_file:
+                # Mapping an empty file raises ValueError
+                with mmap.mmap(cache_file.fileno(), 0,
+                               access=mmap.ACCESS_READ) as mapped:
+                    magic, version, is_neg, exp, length = \
+                        _HEADER.unpack_from(mapped)
+                    if magic != _MAGIC or version != _VERSION or \
+                            len(mapped) != _HEADER.size + length:
+                        return None
+                    with memoryview(mapped) as view:
+                        mant = int.from_bytes(view[_HEADER.size:], 'little')
+        except (OSError, ValueError, struct.error):
+            return None
+        return bool(is_neg), mant, exp
+
+
+# Cache shared by Constants unless they are given their own
+constant_cache = ConstantCache()
+
+
+def _sizeof(obj):
+    '''Rough memory taken up by an object and what it holds (tuples, lists
+    and the attributes of slotted objects such as Sifrs)'''
+    if isinstance(obj, (tuple, list)):
+        return sys.getsizeof(obj) + sum(_sizeof(item) for item in obj)
+    slots = getattr(type(obj), '__slots__', ())
+    return sys.getsizeof(obj) + sum(sys.getsizeof(getattr(obj, slot, None))
+                                    for slot in slots)
+
+
+class MemoCache(object):
+    '''Least recently used memo of results, holding entries (keys and
+    values) up to max_bytes in all and counting hits, misses and
+    evictions'''
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        '''Value held for the key, or else the value of compute() which is
+        then held (if it fits the budget at all)'''
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+
+        value = compute()
+        size = _sizeof(key) + _sizeof(value)
+        if size > self.max_bytes:
+            return value
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (value, size)
+                self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, (_, old_size) = self._entries.popitem(last=False)
+                self.nbytes -= old_size
+                self.evictions += 1
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions,
+                    'entries': len(self._entries), 'nbytes': self.nbytes}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
@@ -0,0 +1,316 @@
+# #############################################################################
+# FUNCTIONS
+# #############################################################################
+# Elementary functions of Sifrs (exp, ln, log, sin, cos and atan) to the
+# precision of their SifrSystem.
+# Each function works in binary fixed point (an integer standing for itself
+# divided by 2^bits) with enough bits for the xcimal places of the system plus
+# guard bits, and rounds once into the system at the end, so any base is
+# handled the same way. The argument is first reduced (by multiples of ln 2 or
+# pi/2 and then by halving, square roots or the half angle formula) so the
+# series only needs a few terms, and the result is built back up from it.
+# ln 2 and pi are summed by binary splitting (see Xuarizm) and kept at the
+# highest precision asked for so far.
+# #############################################################################
+
+import functools
+import logging
+import math
+
+from sifr.sifr import Sifr
+from sifr.systems import SifrScopeException
+from sifr.xuarizm import Xuarizm
+
+# Bits carried past the precision of the system (on top of those lost to the
+# reduction of the argument)
+GUARD_BITS = 32
+
+
+# DECORATORS
+def _traced(name):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(x, *args):
+            ssys = x.ssys
+            if ssys.trace:
+                ssys._trace(logging.DEBUG, "### START " + name)
+            result = func(x, *args)
+            if ssys.trace:
+                ssys._trace(logging.DEBUG,
+                            "### END " + name + ": " + result.sifr)
+            return result
+        return wrapper
+    return decorator
+
+
+# Fixed point helpers
+def _work_bits(ssys):
+    '''Bits needed for the xcimal places of the system with guard bits'''
+    return math.ceil(ssys.xcimal_places * math.log2(ssys.base_no)) + \
+        GUARD_BITS
+
+
+def _halvings(bits):
+    '''Number of times the argument is halved (or rooted) before summing a
+    series, balancing the terms of the series against the steps back'''
+    return max(int(math.sqrt(bits)) // 2, 1)
+
+
+def _to_fixed(x, bits):
+    '''x * 2^bits (truncated towards zero)'''
+    quot, _ = x.ssys._int_divmod(x._mant << bits, x.ssys.base_no**x._exp)
+    return -quot if x.is_neg else quot
+
+
+def _from_fixed(value, bits, ssys):
+    '''Sifr of value / 2^bits rounded to the precision of the system'''
+    if bits < 0:
+        return Sifr._from_ratio(value << -bits, 1, ssys)
+    return Sifr._from_ratio(value, 1 << bits, ssys)
+
+
+def _atan_inv_fixed(n, bits):
+    '''atan(1/n) * 2^bits for a whole number n > 1, summing
+    (-1)^k / ((2k+1) n^(2k+1)) by binary splitting'''
+    terms = math.ceil(bits / (2 * math.log2(n))) + 2
+    _, q_all, b_all, t_all = Xuarizm._split(
+        0, terms,
+        lambda k: -1 if k > 0 else 1,
+        lambda k: n * n if k > 0 else n,
+        lambda k: 1,
+        lambda k: 2*k + 1)
+    return (t_all << bits) // (b_all * q_all)
+
+
+def _ln2_series(bits):
+    '''ln 2 * 2^bits as 2 atanh(1/3) by binary splitting'''
+    terms = math.ceil(bits / math.log2(9)) + 2
+    _, q_all, b_all, t_all = Xuarizm._split(
+        0, terms,
+        lambda k: 1,
+        lambda k: 9 if k > 0 else 3,
+        lambda k: 2,
+        lambda k: 2*k + 1)
+    return (t_all << bits) // (b_all * q_all)
+
+
+def _pi_series(bits):
+    '''pi * 2^bits by Machin's formula 16 atan(1/5) - 4 atan(1/239)'''
+    return 16 * _atan_inv_fixed(5, bits) - 4 * _atan_inv_fixed(239, bits)
+
+
+_held_constants = {}
+
+
+def _constant_fixed(series, bits):
+    '''Constant * 2^bits, cut down from the most precise value worked out so
+    far (the series are worked out to a few more bits than asked for as
+    their last few bits are out)'''
+    held = _held_constants.get(series)
+    if held is None or held[1] < bits:
+        held = (series(bits + 8), bits + 8)
+        _held_constants[series] = held
+    value, held_bits = held
+    return value >> (held_bits - bits)
+
+
+def _ln2_fixed(bits):
+    return _constant_fixed(_ln2_series, bits)
+
+
+def _pi_fixed(bits):
+    return _constant_fixed(_pi_series, bits)
+
+
+# Fixed point cores
+def _ln_fixed(x, bits):
+    '''ln(x) * 2^bits of a positive Sifr'''
+    ssys = x.ssys
+    halvings = _halvings(bits)
+    work = bits + halvings + GUARD_BITS
+    one = 1 << work
+
+    # x = y 2^t with y in [1, 2)
+    numer, denom = x._mant, ssys.base_no**x._exp
+    t = numer.bit_length() - denom.bit_length()
+    if t >= 0:
+        y, _ = ssys._int_divmod(numer << work, denom << t)
+    else:
+        y, _ = ssys._int_divmod(numer << (work - t), denom)
+    while y < one:
+        y, t = y << 1, t - 1
+    while y >= 2 * one:
+        y, t = y >> 1, t + 1
+
+    # ln(y) = 2^halvings ln(y^(1/2^halvings)) = 2^(halvings+1) atanh(z)
+    for _ in range(halvings):
+        y = ssys._int_sqrt(y << work)
+    z, _ = ssys._int_divmod((y - one) << work, y + one)
+    z_sq = (z * z) >> work
+    total, power, k = 0, z, 0
+    while power:
+        total += power // (2*k + 1)
+        power = (power * z_sq) >> work
+        k += 1
+    total <<= halvings + 1
+
+    t_bits = abs(t).bit_length()
+    total += (t * _ln2_fixed(work + t_bits)) >> t_bits
+    return total >> (work - bits)
+
+
+def _sin_cos_fixed(x, bits):
+    '''sin(x) * 2^bits and cos(x) * 2^bits'''
+    halvings = _halvings(bits)
+    # Bits lost taking off the multiples of pi/2 grow with the size of x
+    quad_bits = int(abs(x)).bit_length() + 1
+    work = bits + 2 * halvings + quad_bits + GUARD_BITS
+    one = 1 << work
+
+    quad, reduced = divmod(_to_fixed(x, work), _pi_fixed(work - 1))
+    reduced >>= halvings
+
+    # Taylor series of the reduced angle (in [0, pi/2^(halvings+1)))
+    red_sq = (reduced * reduced) >> work
+    sin, cos = reduced, one
+    sin_term, cos_term, k, sign = reduced, one, 1, -1
+    while sin_term or cos_term:
+        sin_term = ((sin_term * red_sq) >> work) // ((2*k) * (2*k + 1))
+        cos_term = ((cos_term * red_sq) >> work) // ((2*k - 1) * (2*k))
+        sin += sign * sin_term
+        cos += sign * cos_term
+        k, sign = k + 1, -sign
+
+    # Double angle formulae back to the reduced angle
+    for _ in range(halvings):
+        sin, cos = (2 * sin * cos) >> work, one - ((2 * sin * sin) >> work)
+
+    sin, cos = [(sin, cos), (cos, -sin), (-sin, -cos), (-cos, sin)][quad % 4]
+    return sin >> (work - bits), cos >> (work - bits)
+
+
+def _atan_fixed(x, bits):
+    '''atan(x) * 2^bits'''
+    ssys = x.ssys
+    halvings = _halvings(bits)
+    work = bits + halvings + GUARD_BITS
+    one = 1 << work
+
+    # atan(x) = pi/2 - atan(1/x) takes |x| to at most one
+    mant, denom = x._mant, ssys.base_no**x._exp
+    invert = mant > denom
+    if invert:
+        mant, denom = denom, mant
+    y, _ = ssys._int_divmod(mant << work, denom)
+
+    # atan(y) = 2 atan(y / (1 + sqrt(1 + y^2)))
+    for _ in range(halvings):
+        y, _ = ssys._int_divmod(y << work,
+                                one + ssys._int_sqrt(one * one + y * y))
+    y_sq = (y * y) >> work
+    total, power, k, sign = 0, y, 0, 1
+    while power:
+        total += sign * (power // (2*k + 1))
+        power = (power * y_sq) >> work
+        k, sign = k + 1, -sign
+    total <<= halvings
+
+    if invert:
+        total = _pi_fixed(work - 1) - total
+    if x.is_neg:
+        total = -total
+    return total >> (work - bits)
+
+
+# Functions
+@_traced("EXP")
+def exp(x):
+    '''e to the power of x'''
+    ssys = x.ssys
+    bits = _work_bits(ssys)
+
+    # exp(x) = 2^k exp(x - k ln 2), with k from a low precision estimate
+    # (brought down until what is left of x is not negative)
+    k = _to_fixed(x, 64) // _ln2_fixed(64) + 1
+    reduced = -1
+    while reduced < 0:
+        k -= 1
+        if k < -bits:
+            return ssys.zero
+        halvings = _halvings(bits)
+        work = bits + max(k, 0) + halvings + abs(k).bit_length() + \
+            GUARD_BITS
+        reduced = _to_fixed(x, work) - k * _ln2_fixed(work)
+    one = 1 << work
+    reduced >>= halvings
+
+    # Taylor series (the reduced exponent is tiny) and then squared back
+    total, term, n = one, one, 1
+    while term:
+        term = ((term * reduced) >> work) // n
+        total += term
+        n += 1
+    for _ in range(halvings):
+        total = (total * total) >> work
+
+    return _from_fixed(total, work - k, ssys)
+
+
+@_traced("LN")
+def ln(x):
+    '''Natural logarithm of x'''
+    if x.is_neg or x._mant == 0:
+        raise SifrScopeException("Undefined Error: Logarithm of a number " +
+                                 "that isn't positive")
+    bits = _work_bits(x.ssys)
+    return _from_fixed(_ln_fixed(x, bits), bits, x.ssys)
+
+
+@_traced("LOG")
+def log(x, base=None):
+    '''Logarithm of x to the given base (a Sifr or int), by default the base
+    of the system of x'''
+    ssys = x.ssys
+    if base is None:
+        base = ssys.base_no
+    if not isinstance(base, Sifr):
+        base = ssys.from_int(base)
+    if x.is_neg or x._mant == 0 or base.is_neg or base._mant == 0:
+        raise SifrScopeException("Undefined Error: Logarithm of or to a " +
+                                 "number that isn't positive")
+
+    bits = _work_bits(ssys)
+    ln_base = _ln_fixed(base, bits)
+    if ln_base == 0:
+        raise SifrScopeException("Undefined Error: Logarithm to base one")
+    # The quotient loses the bits ln(base) is short of one
+    extra = max(bits - abs(ln_base).bit_length(), 0)
+    if extra:
+        ln_base = _ln_fixed(base, bits + extra)
+    ln_x = _ln_fixed(x, bits + extra)
+    if ln_base < 0:
+        ln_x, ln_base = -ln_x, -ln_base
+    return Sifr._from_ratio(ln_x, ln_base, ssys)
+
+
+@_traced("SIN")
+def sin(x):
+    '''Sine of x (in radians)'''
+    bits = _work_bits(x.ssys)
+    sin, _ = _sin_cos_fixed(x, bits)
+    return _from_fixed(sin, bits, x.ssys)
+
+
+@_traced("COS")
+def cos(x):
+    '''Cosine of x (in radians)'''
+    bits = _work_bits(x.ssys)
+    _, cos = _sin_cos_fixed(x, bits)
+    return _from_fixed(cos, bits, x.ssys)
+
+
+@_traced("ATAN")
+def atan(x):
+    '''Arctangent of x (in radians, between -pi/2 and pi/2)'''
+    bits = _work_bits(x.ssys)
+    return _from_fixed(_atan_fixed(x, bits), bits, x.ssys)
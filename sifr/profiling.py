@@ -0,0 +1,162 @@
+# #############################################################################
+# PROFILING
+# #############################################################################
+# Counts of the calls into the primitives of a SifrSystem (both the numeric
+# engine and the string algorithms), the digits they were given and the time
+# spent in them, gathered while a profile is running:
+#     with ssys.profile() as p:
+#         ...
+#     print(p.report())
+# A profile swaps wrapped versions of the primitives onto the system (and its
+# siblings of other xcimal places, which Constants work in) for as long as it
+# runs and takes them off again after, so a system that isn't being profiled
+# runs exactly the code it would otherwise.
+# #############################################################################
+
+import functools
+import math
+import time
+
+# Primitives of the numeric engine
+NUMERIC_PRIMITIVES = ('_to_num', '_from_num', '_make_sifr', 'convert',
+                      '_num_align', '_num_round', '_num_mul', '_num_div',
+                      '_num_divmod', '_num_from_ratio',
+                      '_num_truncated_ratio', '_num_truncate',
+                      '_num_whole', '_num_int_exp', '_num_root',
+                      '_int_divmod', '_int_reciprocal', '_int_sqrt',
+                      '_int_root', '_int_exp')
+
+# Primitives of the string algorithms
+STRING_PRIMITIVES = ('_dec_combine', '_base_add_alg', '_base_subt_alg',
+                     '_base_mul', '_digit_mul', '_base_div', '_digit_divmod',
+                     '_times_in_num', 'round_half_to_inf', '_norm_ans')
+
+PRIMITIVES = NUMERIC_PRIMITIVES + STRING_PRIMITIVES
+
+# Positions of the arguments of each primitive that hold digits (mantissas,
+# digit strings and Sifrs); exponents, xcimal places, rounding levels and
+# root degrees are left out of the digits of a call
+DIGIT_ARGUMENTS = {'_to_num': (0,), '_from_num': (1,), '_make_sifr': (1,),
+                   'convert': (0,), '_num_align': (0, 2),
+                   '_num_round': (0,), '_num_mul': (0, 2),
+                   '_num_div': (0, 2), '_num_divmod': (0, 2),
+                   '_num_from_ratio': (0, 1),
+                   '_num_truncated_ratio': (0, 1), '_num_truncate': (0,),
+                   '_num_whole': (0,), '_num_int_exp': (0,),
+                   '_num_root': (0,), '_int_divmod': (0, 1),
+                   '_int_reciprocal': (0,), '_int_sqrt': (0,),
+                   '_int_root': (0,), '_int_exp': (0,),
+                   '_dec_combine': (0, 1), '_base_add_alg': (0, 1),
+                   '_base_subt_alg': (0, 1), '_base_mul': (0, 1),
+                   '_digit_mul': (0, 1), '_base_div': (0, 1),
+                   '_digit_divmod': (0, 1), '_times_in_num': (0, 1),
+                   'round_half_to_inf': (0,), '_norm_ans': (0,)}
+
+# Tables of the system the rounding primitives are called through
+ROUNDING_TABLES = ('ROUNDING_FUNCTIONS', 'NUM_ROUNDING_FUNCTIONS')
+
+
+class Profile(object):
+    '''Calls, digits and time of each primitive of the system (and its
+    siblings of other xcimal places) while the profile runs as a context
+    manager. The digits of a call are those of its digit arguments (see
+    DIGIT_ARGUMENTS, integers counted as written in the base), and its time
+    includes that of any primitives it calls in turn (so nested primitives
+    count in both). _make_sifr counts the Sifrs the system makes (interned
+    integers and conversions), not the results of the Sifr operators'''
+    def __init__(self, sifr_system, primitives=PRIMITIVES):
+        self.ssys = sifr_system
+        self.primitives = primitives
+        self.calls = dict.fromkeys(primitives, 0)
+        self.digits = dict.fromkeys(primitives, 0)
+        self.seconds = dict.fromkeys(primitives, 0.0)
+        self.elapsed = 0.0
+        # Systems profiled, with the attributes the wrappers replaced
+        self._attached = {}
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        self._attach(self.ssys)
+        for system in list(self.ssys._place_systems.values()):
+            self._attach(system)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for system, replaced in reversed(list(self._attached.values())):
+            system._profiles.remove(self)
+            for name, previous in replaced.items():
+                if previous is None:
+                    del system.__dict__[name]
+                else:
+                    system.__dict__[name] = previous
+        self._attached.clear()
+        self.elapsed += time.perf_counter() - self._start
+        return False
+
+    def _attach(self, system):
+        '''Swaps the wrapped primitives onto the system (once)'''
+        if id(system) in self._attached:
+            return
+        digits_per_bit = 1 / math.log2(system.base_no)
+        replaced = {}
+        for name in self.primitives:
+            replaced[name] = system.__dict__.get(name)
+            system.__dict__[name] = self._wrap(name, getattr(system, name),
+                                               digits_per_bit)
+        # The rounding tables hold the methods bound when the system was
+        # made, so the wrapped ones are put in copies of them
+        for table in ROUNDING_TABLES:
+            replaced[table] = system.__dict__[table]
+            system.__dict__[table] = {
+                key: system.__dict__.get(func.__name__, func)
+                if func.__name__ in self.primitives else func
+                for key, func in replaced[table].items()}
+        system._profiles.append(self)
+        self._attached[id(system)] = (system, replaced)
+
+    def _wrap(self, name, func, digits_per_bit):
+        calls, digits, seconds = self.calls, self.digits, self.seconds
+        positions = DIGIT_ARGUMENTS.get(name, ())
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            size = 0
+            for pos in positions:
+                if pos >= len(args):
+                    continue
+                arg = args[pos]
+                if isinstance(arg, str):
+                    size += len(arg)
+                    continue
+                # Sifrs count by their mantissas (and signs not at all)
+                arg = getattr(arg, '_mant', arg)
+                if isinstance(arg, int) and not isinstance(arg, bool):
+                    size += math.ceil(abs(arg).bit_length() * digits_per_bit)
+            start = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                seconds[name] += time.perf_counter() - start
+                calls[name] += 1
+                digits[name] += size
+        return wrapper
+
+    def stats(self):
+        '''Calls, digits and seconds of each primitive that was called'''
+        return {name: {'calls': self.calls[name],
+                       'digits': self.digits[name],
+                       'seconds': self.seconds[name]}
+                for name in self.primitives if self.calls[name]}
+
+    def report(self):
+        '''Table of the primitives called, the most time first'''
+        lines = ['{:<20} {:>10} {:>14} {:>12}'.format(
+            'primitive', 'calls', 'digits', 'seconds')]
+        for name, stat in sorted(self.stats().items(),
+                                 key=lambda item: -item[1]['seconds']):
+            lines.append('{:<20} {:>10} {:>14} {:>12.6f}'.format(
+                name, stat['calls'], stat['digits'], stat['seconds']))
+        lines.append('{:<20} {:>10} {:>14} {:>12.6f}'.format(
+            'elapsed', '', '', self.elapsed))
+        return '\n'.join(lines)
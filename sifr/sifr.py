@@ -3,20 +3,119 @@
 # #############################################################################
 # Main Sifr class to define a number according to a SifrSystem (found in the
 # the systems.py file).
+# The number is held in numeric form (sign, integer mantissa and number of
+# xcimal places) which is converted from the string once on instantiation;
+# the sifr string is only rendered, and then cached, when requested.
 # #############################################################################
 
 import logging
-from sifr.systems import SifrSystem
+import math
+from decimal import Decimal, getcontext
+from fractions import Fraction
+
+from sifr.systems import SifrSystem, SifrScopeException
 
 
 class Sifr(object):
     '''A number type that takes a string representing the character
     and the number system represented as the class SifrSystem'''
+    __slots__ = ('ssys', 'is_neg', '_mant', '_exp', '_sifr')
+
     def __init__(self, sifr: str, sifr_system: SifrSystem):
-        self.sifr = sifr
         self.ssys = sifr_system
-        self.no_digits = len(sifr)
-        self.is_neg = sifr[0] == sifr_system.neg_sym
+        self.is_neg, self._mant, self._exp = sifr_system._to_num(sifr)
+        self._sifr = sifr
+
+    @classmethod
+    def _from_num(cls, is_neg, mant, exp, sifr_system):
+        '''Instantiates a Sifr directly from the numeric form'''
+        result = cls.__new__(cls)
+        result.ssys = sifr_system
+        result.is_neg = is_neg and mant != 0
+        result._mant = mant
+        result._exp = exp
+        result._sifr = None
+        return result
+
+    # Interoperability with Python's number types
+    @classmethod
+    def _from_ratio(cls, numer, denom, sifr_system):
+        mant, exp = sifr_system._num_from_ratio(abs(numer), denom)
+        return cls._from_num(numer < 0, mant, exp, sifr_system)
+
+    @classmethod
+    def from_int(cls, n, sifr_system):
+        '''Sifr of a Python integer (interned if small)'''
+        return sifr_system.from_int(n)
+
+    @classmethod
+    def from_fraction(cls, fraction, sifr_system):
+        '''Sifr of a Fraction (or any rational), rounded to the xcimal
+        places of the system'''
+        return cls._from_ratio(fraction.numerator, fraction.denominator,
+                               sifr_system)
+
+    @classmethod
+    def from_decimal(cls, decimal, sifr_system):
+        '''Sifr of a finite Decimal, rounded to the xcimal places of the
+        system'''
+        if not decimal.is_finite():
+            raise SifrScopeException("Only finite numbers can be converted")
+        return cls._from_ratio(*decimal.as_integer_ratio(), sifr_system)
+
+    @classmethod
+    def from_float(cls, number, sifr_system):
+        '''Sifr of the exact binary value of a finite float, rounded to the
+        xcimal places of the system'''
+        if not math.isfinite(number):
+            raise SifrScopeException("Only finite numbers can be converted")
+        # Through Fraction as ints only have as_integer_ratio from Python 3.8
+        return cls.from_fraction(Fraction(number), sifr_system)
+
+    def __int__(self):
+        '''Whole part of the number (truncated towards zero)'''
+        whole, _ = self.ssys._num_whole(self._mant, self._exp)
+        return -whole if self.is_neg else whole
+
+    def to_fraction(self):
+        return Fraction(self._signed(), self.ssys.base_no**self._exp)
+
+    def to_decimal(self, context=None):
+        '''Decimal of the number, rounded once to the precision of the
+        decimal context if it can\'t be held exactly'''
+        context = context or getcontext()
+        return context.divide(Decimal(self._signed()),
+                              Decimal(self.ssys.base_no**self._exp))
+
+    @property
+    def sifr(self):
+        if self._sifr is None:
+            self._sifr = self.ssys._from_num(self.is_neg, self._mant,
+                                             self._exp)
+        return self._sifr
+
+    @property
+    def no_digits(self):
+        return len(self.sifr)
+
+    def _signed(self):
+        return -self._mant if self.is_neg else self._mant
+
+    def _operand(self, other):
+        '''The other operand of a binary operator as a Sifr (an int is
+        taken into this system), or None for any other type so the operator
+        can return NotImplemented and Python try the reflected one (e.g. of
+        a SifrArray)'''
+        if isinstance(other, Sifr):
+            return other
+        if isinstance(other, int):
+            return self.ssys.from_int(other)
+        return None
+
+    def _signed_pair(self, d):
+        '''Both numbers as signed mantissas to the same xcimal places'''
+        return self.ssys._num_align(self._signed(), self._exp,
+                                    d._signed(), d._exp)
 
     # REPRESENTATIONAL DUNDERS
     def __repr__(self):
@@ -24,262 +123,307 @@ class Sifr(object):
 
     # UNARY MAGNITUDE OPERATOR DUNDERS
     def __abs__(self):
-        logging.debug("### START MAIN MAGNITUDE")
-        if self.ssys.neg_sym != self.sifr[0]:
-            result = Sifr(self.ssys._norm_ans(self.sifr), self.ssys)
-        else:
-            result = Sifr(self.ssys._norm_ans(self.sifr[1:]), self.ssys)
-        logging.debug("### END MAIN MAGNITUDE")
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### START MAIN MAGNITUDE")
+        result = Sifr._from_num(False, self._mant, self._exp, self.ssys)
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### END MAIN MAGNITUDE")
         return result
 
     def __neg__(self):
-        logging.debug("### START MAIN NEGATION")
-        if self.is_neg:
-            result = Sifr(self.ssys._norm_ans(self.sifr[1:]), self.ssys)
-        else:
-            result = Sifr(self.ssys._norm_ans(self.ssys.neg_sym + self.sifr),
-                          self.ssys)
-        logging.debug("### END MAIN NEGATION")
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### START MAIN NEGATION")
+        result = Sifr._from_num(not self.is_neg, self._mant, self._exp,
+                                self.ssys)
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### END MAIN NEGATION")
         return result
 
     def __pos__(self):
-        logging.debug("### START MAIN POSITIVE")
-        logging.debug("### END MAIN POSITIVE")
-        return Sifr(self.ssys._norm_ans(self.sifr), self.ssys)
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### START MAIN POSITIVE")
+            self.ssys._trace(logging.DEBUG, "### END MAIN POSITIVE")
+        return Sifr._from_num(self.is_neg, self._mant, self._exp, self.ssys)
 
     # ARITHMETIC DUNDERS
     def __add__(self, add_no):
-        logging.debug("### START MAIN ADD")
+        add_no = self._operand(add_no)
+        if add_no is None:
+            return NotImplemented
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### START MAIN ADD")
         if self.ssys != add_no.ssys:
             raise Exception("Sifr Systems do not match and thus ",
                             "can't be added together")
 
-        # Assign short names for arithmetic functions
-        b_add = self.ssys._base_add_alg
-        neg_sym = self.ssys.neg_sym
-        dec_comb = self.ssys._dec_combine
-        norm = self.ssys._norm_ans
-
-        # Two positive numbers to add
-        if not self.is_neg and not add_no.is_neg:
-            logging.info("  Both numbers are not negative, proceeding to add")
-            added, _ = dec_comb(self.sifr, add_no.sifr, b_add)
-            result = Sifr(norm(added), self.ssys)
-
-        # Two negative numbers to "add"
-        elif self.is_neg and add_no.is_neg:
-            logging.info("  Both numbers are negative, proceeding to add")
-            added, _ = dec_comb(self.sifr[1:], add_no.sifr[1:], b_add)
-            result = Sifr(norm(neg_sym + added), self.ssys)
-
-        # Negative and positive to counteract
-        else:
-            logging.info("  Only one of either numbers is negative, " +
-                         "to subtract absolute values")
-            b_neg = self.ssys._base_subt_alg
-            self_mag = self.__abs__().sifr
-            add_no_mag = add_no.__abs__().sifr
-            added, zero_crossed = dec_comb(self_mag, add_no_mag, b_neg)
-            if self.is_neg and zero_crossed:
-                result = Sifr(norm(added), self.ssys)
-            elif self.is_neg and not zero_crossed:
-                result = Sifr(norm(neg_sym + added), self.ssys)
-            elif not self.is_neg and zero_crossed:
-                result = Sifr(norm(neg_sym + added), self.ssys)
-            elif not self.is_neg and not zero_crossed:
-                result = Sifr(norm(added), self.ssys)
-
-        logging.debug("### END MAIN ADD")
+        # Signed mantissas are added so the sign of the answer falls out
+        m1, m2, exp = self._signed_pair(add_no)
+        added = m1 + m2
+        result = Sifr._from_num(added < 0, abs(added), exp, self.ssys)
+
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### END MAIN ADD")
         return result
 
     def __sub__(self, sub_no):
-        logging.debug("### MAIN START SUB")
-        norm = self.ssys._norm_ans
-        # If subtracted number is negative just add
-        if sub_no.sifr[0] == self.ssys.neg_sym:
-            logging.debug("### END MAIN SUB")
-            result = self.__add__(Sifr(sub_no.sifr[1:], self.ssys))
-        # Otherwise just add the negative
-        else:
-            logging.debug("### END MAIN SUB")
-            result = self.__add__(Sifr(norm(self.ssys.neg_sym + sub_no.sifr),
-                                       self.ssys))
-        return result
+        sub_no = self._operand(sub_no)
+        if sub_no is None:
+            return NotImplemented
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### MAIN START SUB")
+            self.ssys._trace(logging.DEBUG, "### END MAIN SUB")
+        return self.__add__(-sub_no)
 
     def __mul__(self, mul_no):
-        logging.debug("### START MAIN MULT")
-        raw_result = self.ssys._base_mul(self.__abs__().sifr,
-                                         mul_no.__abs__().sifr)
-        if (self.is_neg and mul_no.is_neg) or (not self.is_neg
-                                               and not mul_no.is_neg):
-            result = self.ssys._norm_ans(raw_result)
-        else:
-            result = self.ssys._norm_ans(self.ssys.neg_sym + raw_result)
-        logging.debug("### END MAIN MULT")
-        return Sifr(result, self.ssys)
+        mul_no = self._operand(mul_no)
+        if mul_no is None:
+            return NotImplemented
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### START MAIN MULT")
+        mant, exp = self.ssys._num_mul(self._mant, self._exp,
+                                       mul_no._mant, mul_no._exp)
+        result = Sifr._from_num(self.is_neg != mul_no.is_neg, mant, exp,
+                                self.ssys)
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### END MAIN MULT")
+        return result
 
     def __floordiv__(self, div_no):
-        logging.debug("### START FLOOR DIV")
-        raw_result, mod = self.ssys._times_in_num(self.__abs__().sifr,
-                                                  div_no.__abs__().sifr)
-        if (self.is_neg and div_no.is_neg) or (not self.is_neg
-                                               and not div_no.is_neg):
-            result = Sifr(self.ssys._norm_ans(raw_result), self.ssys)
+        div_no = self._operand(div_no)
+        if div_no is None:
+            return NotImplemented
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### START FLOOR DIV")
+        quot, mod, _ = self.ssys._num_divmod(self._mant, self._exp,
+                                             div_no._mant, div_no._exp)
+        if self.is_neg == div_no.is_neg:
+            result = Sifr._from_num(False, quot, 0, self.ssys)
         else:
-            result = Sifr(self.ssys._norm_ans(self.ssys.neg_sym + raw_result),
-                          self.ssys)
-            if Sifr(mod, self.ssys) != Sifr(self.ssys.iden, self.ssys):
-                result = result - Sifr(self.ssys.digit_list[1], self.ssys)
-        logging.debug("### END FLOOR DIV")
+            # Rounds towards negative infinity if anything is left over
+            quot = quot + 1 if mod != 0 else quot
+            result = Sifr._from_num(True, quot, 0, self.ssys)
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### END FLOOR DIV")
         return result
 
     def __mod__(self, div_no):
-        logging.debug("### START MAIN MOD")
-        logging.debug("    Seeing what is left over when int " + div_no.sifr +
-                      "'s are removed from " + self.sifr)
-        raw_result = self.ssys._times_in_num(self.__abs__().sifr,
-                                             div_no.__abs__().sifr)[1]
-        if div_no.is_neg:
-            result = Sifr(self.ssys._norm_ans(self.ssys.neg_sym + raw_result),
-                          self.ssys)
-        else:
-            result = Sifr(self.ssys._norm_ans(raw_result),
-                          self.ssys)
-        if self.is_neg != div_no.is_neg and result != Sifr(self.ssys.iden,
-                                                           self.ssys):
+        div_no = self._operand(div_no)
+        if div_no is None:
+            return NotImplemented
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### START MAIN MOD")
+            self.ssys._trace(logging.DEBUG,
+                             "    Seeing what is left over when int " +
+                             div_no.sifr + "'s are removed from " + self.sifr)
+        _, mod, exp = self.ssys._num_divmod(self._mant, self._exp,
+                                            div_no._mant, div_no._exp)
+        result = Sifr._from_num(div_no.is_neg, mod, exp, self.ssys)
+        if self.is_neg != div_no.is_neg and mod != 0:
             result = div_no - result
-        logging.debug("### END MAIN MOD")
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### END MAIN MOD")
         return result
 
     def __truediv__(self, div_no):
-        logging.debug("### START MAIN DIV")
-        raw_result = self.ssys._base_div(self.__abs__().sifr,
-                                         div_no.__abs__().sifr)
-        if (self.is_neg and div_no.is_neg) or (not self.is_neg
-                                               and not div_no.is_neg):
-            result = self.ssys._norm_ans(raw_result)
-        else:
-            result = self.ssys._norm_ans(self.ssys.neg_sym + raw_result)
-        logging.debug("### END MAIN DIV")
-        return Sifr(result, self.ssys)
+        div_no = self._operand(div_no)
+        if div_no is None:
+            return NotImplemented
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### START MAIN DIV")
+        mant, exp = self.ssys._num_div(self._mant, self._exp,
+                                       div_no._mant, div_no._exp)
+        result = Sifr._from_num(self.is_neg != div_no.is_neg, mant, exp,
+                                self.ssys)
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### END MAIN DIV")
+        return result
+
+    def __pow__(self, exp, mod=None):
+        exp = self._operand(exp)
+        if exp is None:
+            return NotImplemented
+        if mod is not None:
+            mod = self._operand(mod)
+            if mod is None:
+                return NotImplemented
+            return self._mod_pow(exp, mod)
 
-    def __pow__(self, exp):
-        logging.info("### START MAIN EXPONENTIATION")
-        logging.info("   " + self.sifr + " to the power of " + exp.sifr)
+        if self.ssys.trace:
+            self.ssys._trace(logging.INFO, "### START MAIN EXPONENTIATION")
+            self.ssys._trace(logging.INFO,
+                             "   " + self.sifr + " to the power of " +
+                             exp.sifr)
 
-        raw_result = self.ssys._int_exp(self.__abs__().sifr,
-                                        exp.__abs__().sifr)
-        logging.debug("  Raw result without negatives: " + raw_result)
+        raw_m, raw_e = self.ssys._num_int_exp(self._mant, self._exp,
+                                              exp._mant, exp._exp)
+        result = Sifr._from_num(False, raw_m, raw_e, self.ssys)
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG,
+                             "  Raw result without negatives: " + result.sifr)
 
         if exp.is_neg:
-            logging.debug("    Exponent is negative")
-            inv_result = Sifr(self.ssys._norm_ans(raw_result), self.ssys)
-            result = Sifr(self.ssys.unit, self.ssys) / inv_result
+            if self.ssys.trace:
+                self.ssys._trace(logging.DEBUG, "    Exponent is negative")
+            result = self.ssys.one / result
 
         else:
-            logging.debug("    Exponent is positive")
-            result = Sifr(self.ssys._norm_ans(raw_result), self.ssys)
+            if self.ssys.trace:
+                self.ssys._trace(logging.DEBUG, "    Exponent is positive")
 
         if self.is_neg:
-            logging.debug("    Number to be exponentiated is negative")
-            two_mod = exp % (Sifr(self.ssys.unit, self.ssys) +
-                             Sifr(self.ssys.unit, self.ssys))
-            if two_mod == Sifr(self.ssys.unit, self.ssys):
-                logging.debug("    Exponent is odd therefore answer " +
-                              "is negative")
-                result = Sifr(self.ssys.neg_sym + result.sifr, self.ssys)
-
-        logging.info("### END MAIN EXPONENTIATION: " + result.sifr)
+            if self.ssys.trace:
+                self.ssys._trace(logging.DEBUG,
+                                 "    Number to be exponentiated is negative")
+            two_mod = exp % self.ssys.from_small(2)
+            if two_mod == self.ssys.one:
+                if self.ssys.trace:
+                    self.ssys._trace(logging.DEBUG,
+                                     "    Exponent is odd therefore answer " +
+                                     "is negative")
+                result = -result
+
+        if self.ssys.trace:
+            self.ssys._trace(logging.INFO,
+                             "### END MAIN EXPONENTIATION: " + result.sifr)
         return result
 
+    def _mod_pow(self, exp, mod):
+        '''Modular exponentiation (three argument pow) of integer Sifrs,
+        following the signs of Python's pow'''
+        if self.ssys.trace:
+            self.ssys._trace(logging.INFO,
+                             "### START MAIN MODULAR EXPONENTIATION")
+        ints = []
+        for num in (self, exp, mod):
+            whole, xcim = self.ssys._num_whole(num._mant, num._exp)
+            if xcim != 0:
+                raise SifrScopeException("Modular exponentiation only " +
+                                         "implemented for integers")
+            ints.append(-whole if num.is_neg else whole)
+        base, exp_int, mod_int = ints
+        if mod_int == 0:
+            raise SifrScopeException("Zero Division Error")
+        if exp_int < 0:
+            # pow only takes negative exponents from Python 3.8, so the
+            # base is inverted first and raised to the magnitude
+            base, exp_int = Sifr._mod_inverse(base, abs(mod_int)), -exp_int
+        result = pow(base, exp_int, mod_int)
+        if self.ssys.trace:
+            self.ssys._trace(logging.INFO,
+                             "### END MAIN MODULAR EXPONENTIATION")
+        return Sifr._from_num(result < 0, abs(result), 0, self.ssys)
+
+    @staticmethod
+    def _mod_inverse(num, mod):
+        '''Inverse of an integer modulo a positive integer by the extended
+        Euclidean algorithm'''
+        old_rem, rem = num % mod, mod
+        old_coeff, coeff = 1, 0
+        while rem:
+            quot = old_rem // rem
+            old_rem, rem = rem, old_rem - quot * rem
+            old_coeff, coeff = coeff, old_coeff - quot * coeff
+        if old_rem != 1:
+            raise SifrScopeException("Undefined Error: Base is not " +
+                                     "invertible for the modulus")
+        return old_coeff % mod
+
     # RELATIONAL DUNDERS
     def __eq__(self, d):
-        logging.debug("### START MAIN EQUAL")
-        logging.debug("    Comparing " + self.sifr + " and " + d.sifr)
-        if not self.is_neg and not d.is_neg:
-            _, equal = self.ssys._orderer(self.sifr, d.sifr)
-        elif self.is_neg and d.is_neg:
-            _, equal = self.ssys._orderer(self.__abs__().sifr,
-                                          d.__abs__().sifr)
-        elif self.is_neg and not d.is_neg:
-            equal = False
-        elif not self.is_neg and d.is_neg:
-            equal = False
-        logging.debug("### END MAIN EQUAL")
-        return equal
+        d = self._operand(d)
+        if d is None:
+            return NotImplemented
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### START MAIN EQUAL")
+            self.ssys._trace(logging.DEBUG,
+                             "    Comparing " + self.sifr + " and " + d.sifr)
+        m1, m2, _ = self._signed_pair(d)
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### END MAIN EQUAL")
+        return m1 == m2
 
     def __gt__(self, d):
-        logging.debug("### START MAIN GREATER THAN")
-        if not self.is_neg and not d.is_neg:
-            greater, _ = self.ssys._orderer(self.sifr, d.sifr)
-        elif self.is_neg and d.is_neg:
-            not_greater, equal = self.ssys._orderer(self.__abs__().sifr,
-                                                    d.__abs__().sifr)
-            greater = not not_greater and not equal
-        elif self.is_neg and not d.is_neg:
-            greater = False
-        elif not self.is_neg and d.is_neg:
-            greater = True
-        logging.debug("### END MAIN GREATER THAN")
-        return greater
+        d = self._operand(d)
+        if d is None:
+            return NotImplemented
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### START MAIN GREATER THAN")
+        m1, m2, _ = self._signed_pair(d)
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### END MAIN GREATER THAN")
+        return m1 > m2
 
     def __lt__(self, d):
-        logging.debug("### START MAIN LESS THAN")
-        if not self.is_neg and not d.is_neg:
-            greater, equal = self.ssys._orderer(self.sifr, d.sifr)
-        elif self.is_neg and d.is_neg:
-            not_greater, equal = self.ssys._orderer(self.__abs__().sifr,
-                                                    d.__abs__().sifr)
-            greater = not not_greater
-        elif self.is_neg and not d.is_neg:
-            greater = False
-            equal = False
-        elif not self.is_neg and d.is_neg:
-            greater = True
-            equal = False
-        logging.debug("### END MAIN LESS THAN")
-        return not greater and not equal
+        d = self._operand(d)
+        if d is None:
+            return NotImplemented
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### START MAIN LESS THAN")
+        m1, m2, _ = self._signed_pair(d)
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### END MAIN LESS THAN")
+        return m1 < m2
 
     def __ge__(self, d):
-        logging.debug("### START MAIN GREATER THAN OR EQUAL TO")
-        if not self.is_neg and not d.is_neg:
-            greater, equal = self.ssys._orderer(self.sifr, d.sifr)
-        elif self.is_neg and d.is_neg:
-            not_greater, equal = self.ssys._orderer(self.__abs__().sifr,
-                                                    d.__abs__().sifr)
-            greater = not not_greater
-        elif self.is_neg and not d.is_neg:
-            greater = False
-            equal = False
-        elif not self.is_neg and d.is_neg:
-            greater = True
-            equal = False
-        logging.debug("### END MAIN GREATER THAN OR EQUAL TO")
-        return greater or equal
+        d = self._operand(d)
+        if d is None:
+            return NotImplemented
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG,
+                             "### START MAIN GREATER THAN OR EQUAL TO")
+        m1, m2, _ = self._signed_pair(d)
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG,
+                             "### END MAIN GREATER THAN OR EQUAL TO")
+        return m1 >= m2
 
     def __le__(self, d):
-        logging.debug("### START MAIN LESS THAN OR EQUAL TO")
-        if not self.is_neg and not d.is_neg:
-            greater, equal = self.ssys._orderer(self.sifr, d.sifr)
-        elif self.is_neg and d.is_neg:
-            not_greater, equal = self.ssys._orderer(self.__abs__().sifr,
-                                                    d.__abs__().sifr)
-            greater = not not_greater
-        elif self.is_neg and not d.is_neg:
-            greater = False
-            equal = False
-        elif not self.is_neg and d.is_neg:
-            greater = True
-            equal = False
-        logging.debug("### END MAIN LESS THAN OR EQUAL TO")
-        return not greater or equal
+        d = self._operand(d)
+        if d is None:
+            return NotImplemented
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG,
+                             "### START MAIN LESS THAN OR EQUAL TO")
+        m1, m2, _ = self._signed_pair(d)
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG,
+                             "### END MAIN LESS THAN OR EQUAL TO")
+        return m1 <= m2
 
     # Extra Unary Functions
 
+    def to_system(self, sifr_system):
+        '''The same number in another SifrSystem, rounded to its xcimal
+        places'''
+        return sifr_system.convert(self)
+
+    def sqrt(self):
+        '''Square root to the precision of the system'''
+        return self.root(2)
+
+    def root(self, n):
+        '''nth root to the precision of the system, where n is a whole
+        number (a Sifr or int); odd roots of negative numbers are negative
+        and negative n gives the reciprocal of the root'''
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### START MAIN ROOT")
+        if isinstance(n, Sifr):
+            n = int(n) if n == n.round(0) else None
+        if not isinstance(n, int) or n == 0:
+            raise SifrScopeException("Roots only implemented for nonzero " +
+                                     "whole numbers")
+        if self.is_neg and n % 2 == 0:
+            raise SifrScopeException("Undefined Error: Even root of a " +
+                                     "negative number")
+
+        mant, exp = self.ssys._num_root(self._mant, self._exp, abs(n))
+        result = Sifr._from_num(self.is_neg, mant, exp, self.ssys)
+        if n < 0:
+            result = self.ssys.one / result
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "### END MAIN ROOT")
+        return result
+
     def round(self, round_level):
-        if not self.is_neg:
-            rounded = self.ssys.round(self.sifr, round_level)
-        else:
-            rounded = self.ssys.neg_sym + self.ssys.round(self.__abs__().sifr,
-                                                          round_level)
-        return Sifr(rounded, self.ssys)
+        mant, exp = self.ssys._num_round(self._mant, self._exp, round_level)
+        return Sifr._from_num(self.is_neg, mant, exp, self.ssys)
@@ -8,17 +8,46 @@
 # number for the system
 # #############################################################################
 
+import functools
 import logging
+import math
+import threading
+
+from sifr.cache import MemoCache
+from sifr.profiling import Profile
+
+# Tracing is written to the logger of the package ('sifr') and only when it is
+# switched on for the SifrSystem (trace=True). Every trace call is guarded by
+# that switch so no message is built when it is off.
+logger = logging.getLogger('sifr')
+_trace_mask = threading.local()
 
 
 # DECORATORS
 def mask_logging(func):
+    '''Silences the tracing of the wrapped call (and anything it calls) in
+    the current thread, without touching the logging configuration'''
+    @functools.wraps(func)
     def wrapper(*args):
-        prev_log_level = logging.root.level
-        logging.getLogger().setLevel(logging.ERROR)
-        result = func(*args)
-        logging.getLogger().setLevel(prev_log_level)
-        return result
+        depth = getattr(_trace_mask, 'depth', 0)
+        _trace_mask.depth = depth + 1
+        try:
+            return func(*args)
+        finally:
+            _trace_mask.depth = depth
+    return wrapper
+
+
+def memoized(func):
+    '''Serves repeated calls of the method (with the same operands and
+    precision) from the memo of the SifrSystem when it is switched on, see
+    SifrSystem.enable_memo'''
+    @functools.wraps(func)
+    def wrapper(self, *args):
+        if self.memo is None:
+            return func(self, *args)
+        key = (func.__name__, self.xcimal_places) + args
+        return self.memo.get_or_compute(key, lambda: func(self, *args))
     return wrapper
 
 
@@ -31,10 +60,10 @@ class SifrScopeException(Exception):
 
 # SYSTEM
 class SifrSystem(object):
-    '''(digit_list, radix, neg_sym, xcimal_places, round_type)
+    '''(digit_list, radix, neg_sym, xcimal_places, round_type, trace)
     '''
     def __init__(self, digit_list='0123456789', radix='.', neg_sym='-',
-                 xcimal_places=40, round_type='half2inf'):
+                 xcimal_places=40, round_type='half2inf', trace=False):
         unique_digits = len(set(digit_list)) != len(digit_list)
         radix_not_in_digits = radix not in digit_list
         neg_not_in_digits = neg_sym not in digit_list
@@ -48,46 +77,247 @@ class SifrSystem(object):
         self.iden = digit_list[0]
         self.unit = self.digit_list[1]
         self.round_type = round_type
+        # Writes every step of the arithmetic to the 'sifr' logger
+        self.trace = trace
+
+        # Number of digits from which multiplication switches from
+        # schoolbook to Karatsuba
+        self.karatsuba_threshold = 24
+        # Number of bits of both divisor and quotient from which integer
+        # division switches to Newton reciprocal division
+        self.newton_threshold = 100000
+        # Integers from -small_int_bound to small_int_bound are interned by
+        # from_int so the same Sifr is returned on every call
+        self.small_int_bound = 256
+        self._interned = {}
+        self._interned_base_powers = {}
+        # Systems of the same numbering to other xcimal places (see
+        # with_xcimal_places), shared by all of them
+        self._place_systems = {}
+        # Memo of exponentiation and Formulae results (off unless switched
+        # on by enable_memo)
+        self.memo = None
+        # Profiles running on this system (see profile)
+        self._profiles = []
+        # Number of digits from which conversion between digits and integers
+        # is split in halves at a power of the base (divide and conquer)
+        self.conversion_threshold = 256
 
         self.ROUNDING_FUNCTIONS = {'half2inf': self.round_half_to_inf}
+        self.NUM_ROUNDING_FUNCTIONS = {'half2inf':
+                                       self._num_round_half_to_inf}
 
         self.base_no = len(self.digit_list)
-        logging.debug("SifrSystem instantiated with characters: " +
-                      str(digit_list) +
-                      ", sub-integer separator: " +
-                      str(radix) +
-                      ", and negative symbol: " +
-                      neg_sym)
+        self._build_digit_tables()
+        if self.trace:
+            self._trace(logging.DEBUG,
+                        "SifrSystem instantiated with characters: " +
+                        str(digit_list) + ", sub-integer separator: " +
+                        str(radix) + ", and negative symbol: " + neg_sym)
+
+    def _trace(self, level, message):
+        '''Writes a trace message unless tracing is masked in this thread.
+        Only to be called behind a check of self.trace'''
+        if not getattr(_trace_mask, 'depth', 0):
+            logger.log(level, message)
+
+    # Interned constants
+    # Sifrs are immutable, so the constants built over and over in series
+    # (zero, one, small integers, the base and its powers) are built once per
+    # system and shared.
+
+    def _make_sifr(self, is_neg, mant, exp):
+        # Imported here as sifr.sifr imports this module
+        from sifr.sifr import Sifr
+        return Sifr._from_num(is_neg, mant, exp, self)
+
+    def from_small(self, n):
+        '''The interned Sifr of an integer within small_int_bound'''
+        try:
+            return self._interned[n]
+        except KeyError:
+            if abs(n) > self.small_int_bound:
+                raise SifrScopeException("Only integers up to " +
+                                         str(self.small_int_bound) +
+                                         " are interned")
+            result = self._interned[n] = self._make_sifr(n < 0, abs(n), 0)
+            return result
+
+    def from_int(self, n):
+        '''Sifr of a Python integer, interned if within small_int_bound'''
+        if -self.small_int_bound <= n <= self.small_int_bound:
+            return self.from_small(n)
+        return self._make_sifr(n < 0, abs(n), 0)
+
+    def base_power(self, exp=1):
+        '''The interned Sifr of the base raised to an integer exponent'''
+        try:
+            return self._interned_base_powers[exp]
+        except KeyError:
+            if exp >= 0:
+                result = self._make_sifr(False, self.base_no**exp, 0)
+            else:
+                result = self._make_sifr(False, 1, -exp)
+            self._interned_base_powers[exp] = result
+            return result
+
+    def convert(self, sifr):
+        '''Converts a Sifr of any system into this one, rounding the xcimals
+        to the xcimal places of this system'''
+        src = sifr.ssys
+        if src is self:
+            return sifr
+        mant, exp = self._num_from_ratio(sifr._mant, src.base_no**sifr._exp)
+        return self._make_sifr(sifr.is_neg, mant, exp)
+
+    # Systems are the same if they are set up the same, which also keeps the
+    # Sifrs of a system that has been pickled (e.g. to send to another
+    # process) working with those of the original
+    def _setup(self):
+        return (self.digit_list, self.radix, self.neg_sym,
+                self.xcimal_places, self.round_type)
+
+    def __eq__(self, other):
+        # Sifrs of the same system are checked on every operation, so the
+        # set ups are only compared for systems that are not one and the same
+        if other is self:
+            return True
+        return isinstance(other, SifrSystem) and \
+            self._setup() == other._setup()
+
+    def __hash__(self):
+        return hash(self._setup())
+
+    def __reduce__(self):
+        '''Pickles the set up of the system (its tables and caches are
+        built again when it is unpickled)'''
+        return (SifrSystem, self._setup() + (self.trace,),
+                {'karatsuba_threshold': self.karatsuba_threshold,
+                 'newton_threshold': self.newton_threshold,
+                 'small_int_bound': self.small_int_bound,
+                 'conversion_threshold': self.conversion_threshold})
+
+    def enable_memo(self, max_bytes=64 * 2**20):
+        '''Switches on memoizing exponentiation and Formulae results in
+        this system, holding up to max_bytes of them with least recently
+        used eviction. Returns the memo (whose stats() gives the hit and
+        miss counts). The memo is shared with the siblings of other xcimal
+        places, which Constants work in'''
+        self.memo = MemoCache(max_bytes)
+        for system in self._place_systems.values():
+            system.memo = self.memo
+        return self.memo
+
+    def disable_memo(self):
+        self.memo = None
+        for system in self._place_systems.values():
+            system.memo = None
+
+    def profile(self, primitives=None):
+        '''Profile of the calls into the primitives of this system (and
+        its siblings of other xcimal places) to use as a context manager,
+        e.g. with ssys.profile() as p: ... then p.report(). Systems not being
+        profiled aren't slowed at all'''
+        if primitives is None:
+            return Profile(self)
+        return Profile(self, primitives)
+
+    def with_xcimal_places(self, xcimal_places):
+        '''The same numbering system to another number of xcimal places,
+        made once per number of places so its Sifrs keep the one system'''
+        if xcimal_places == self.xcimal_places:
+            return self
+        if xcimal_places not in self._place_systems:
+            system = SifrSystem(self.digit_list, self.radix, self.neg_sym,
+                                xcimal_places, self.round_type, self.trace)
+            system.karatsuba_threshold = self.karatsuba_threshold
+            system.newton_threshold = self.newton_threshold
+            system.conversion_threshold = self.conversion_threshold
+            # One registry for all the places, so a system made from a
+            # sibling (as the AGM working system is) is still reached from
+            # the first system, as for enable_memo and profile
+            system._place_systems = self._place_systems
+            self._place_systems.setdefault(self.xcimal_places, self)
+            self._place_systems[xcimal_places] = system
+        system = self._place_systems[xcimal_places]
+        # Memo keys hold the xcimal places so siblings share the one memo
+        system.memo = self.memo
+        for profile in self._profiles:
+            profile._attach(system)
+        return system
+
+    @property
+    def zero(self):
+        return self.from_small(0)
+
+    @property
+    def one(self):
+        return self.from_small(1)
+
+    def _build_digit_tables(self):
+        '''Builds the lookup tables used by the digit primitives so that no
+        operation has to walk the digit list to find a digit's position'''
+        base = self.base_no
+        digits = self.digit_list
+
+        # Character to index (the index to character table is digit_list)
+        self.digit_index = {dig: ind for ind, dig in enumerate(digits)}
+
+        # Successor and predecessor of each digit with the carry flag
+        self._incr_table = {dig: (digits[(ind + 1) % base], ind == base - 1)
+                            for ind, dig in enumerate(digits)}
+        self._incr_inv_table = {dig: (digits[ind - 1], ind == 0)
+                                for ind, dig in enumerate(digits)}
+
+        # Digit and carry for every possible sum of two digits and a carry
+        # (0 to 2b-1) and for every difference less a borrow (-b to b-1),
+        # the latter being offset by the base so it can be indexed
+        self._sum_table = [(digits[tot % base], tot >= base)
+                           for tot in range(2*base)]
+        self._diff_table = [(digits[diff % base], diff < base)
+                            for diff in range(2*base)]
+
+        # Digit of the complement against the base used to subtract from a
+        # set of identities
+        self._iden_sub_table = str.maketrans(digits,
+                                             digits[0] + digits[1:][::-1])
+
+        # First digit index that rounds up
+        self._round_up_index = round(base / 2 + 0.1)
+
+        # Translation to and from the digits Python uses for the base so the
+        # builtin conversions can be used where they exist
+        self._digit_set = frozenset(digits)
+        self._to_std = self._from_std = None
+        self._std_format = None
+        if base <= 36:
+            std_digits = '0123456789abcdefghijklmnopqrstuvwxyz'[:base]
+            self._to_std = str.maketrans(digits, std_digits)
+            self._from_std = str.maketrans(std_digits, digits)
+            self._std_format = {2: 'b', 8: 'o', 10: 'd', 16: 'x'}.get(base)
+        self._int_powers = {}
+
+    def _digit_indices(self, d):
+        '''Returns the index of every digit in the sequence'''
+        try:
+            return [self.digit_index[dig] for dig in d]
+        except KeyError:
+            raise Exception("Digit not in list and thus different " +
+                            "numbering system")
 
     def incr(self, prev_no):
-        if prev_no not in self.digit_list:
+        try:
+            return self._incr_table[prev_no]
+        except KeyError:
             raise Exception("Digit not in list and thus different " +
                             "numbering system")
-        disp_next = False
-        for digit in self.digit_list:
-            if disp_next:
-                carry = False
-                return digit, carry
-            if digit == prev_no:
-                disp_next = True
-        # If there is no successor, then return identity
-        carry = True
-        return self.digit_list[0], carry
 
     def _incr_inv(self, prev_no):
-        if prev_no not in self.digit_list:
+        try:
+            return self._incr_inv_table[prev_no]
+        except KeyError:
             raise Exception("Digit not in list and thus different " +
                             "numbering system")
-        disp_next = False
-        for digit in self.digit_list[::-1]:
-            if disp_next:
-                carry = False
-                return digit, carry
-            if digit == prev_no:
-                disp_next = True
-        # If there is no successor, then return highest number
-        carry = True
-        return self.digit_list[-1], carry
 
     def _dec_split(self, d):
         ''' Splits a decimal (non-negative) into it's consituent parts'''
@@ -103,80 +333,49 @@ class SifrSystem(object):
         this only adds to the length of the sequence.
         Returns: [Added sequence, next digit should be carried]'''
 
-        logging.debug("  ### START BASE ADD")
-        result = ''
+        if self.trace:
+            self._trace(logging.DEBUG, "  ### START BASE ADD")
 
         d1, d2 = self._pad_iden(d1, d2, end=False)
-        logging.debug("   Adding " + d2 + " to " + d1)
+        if self.trace:
+            self._trace(logging.DEBUG, "   Adding " + d2 + " to " + d1)
 
-        base_digit_range = range(1, len(d1)+1)
+        sum_table = self._sum_table
+        result = []
         carry = False
 
-        for digit in base_digit_range:
-            if len(d1) == 0:
-                break
-
-            d1_digit = d1[-1]
-            d1 = d1[:-1]
-
+        for d1_ind, d2_ind in zip(self._digit_indices(d1)[::-1],
+                                  self._digit_indices(d2)[::-1]):
             # If addition exceeds base in previous another is added
-            if carry:
-                d1_digit, dig_carry = self.incr(d1_digit)
-                carry = True if dig_carry else False
-
-            if len(d2) != 0:
-                logging.debug("   Add " + d1_digit + " and " + d2[-1])
-                # Adds the digit to be added
-                for dig_seq in self.digit_list:
-                    if dig_seq == d2[-1]:
-                        d2 = d2[:-1]
-                        break
-                    d1_digit, dig_carry = self.incr(d1_digit)
-                    carry = True if dig_carry else carry
-
-            logging.debug("   Result: " + d1_digit)
-            result = d1_digit + result
-            logging.debug("   New digit for step: " + str(result))
-
-        logging.info("   Final Base Add Result: " + str(result))
-        logging.debug("  ### END BASE ADD")
+            res_digit, carry = sum_table[d1_ind + d2_ind + carry]
+            result.append(res_digit)
+
+        result = ''.join(result[::-1])
+        if self.trace:
+            self._trace(logging.INFO,
+                        "   Final Base Add Result: " + str(result))
+            self._trace(logging.DEBUG, "  ### END BASE ADD")
         return result, carry
 
     def _from_iden_sub(self, d):
         ''' Subtracts the digit from a set of zeroes, used for
         when zero is crossed and looking to change the numbers '''
-        logging.debug("   # Number to zero sub: " + d)
-        result = ''
-        rev_dig_list = self.digit_list[0] + self.digit_list[1:][::-1]
-        for dig in d:
-            ind = 0
-            counts = self.digit_list
-            for count in counts:
-                if dig == count:
-                    break
-                ind += 1
-            result += rev_dig_list[ind]
-        logging.debug("   # Zero subbed number: " + result)
+        if self.trace:
+            self._trace(logging.DEBUG, "   # Number to zero sub: " + d)
+        result = d.translate(self._iden_sub_table)
+        if self.trace:
+            self._trace(logging.DEBUG, "   # Zero subbed number: " + result)
         return result
 
     def _pad_iden(self, d1, d2, end=True):
         ''' Adds addition identity characters to digits (at end-True or
         start-False) to the arithmetic algorithm lines up to right digit '''
         max_len = max(len(d1), len(d2))
-        d1_padded = d1
-        d2_padded = d2
-        for ind in range(1, max_len + 1):
-            if end:
-                if ind > len(d1):
-                    d1_padded += self.iden
-                if ind > len(d2):
-                    d2_padded += self.iden
-            elif not end:
-                if ind > len(d1):
-                    d1_padded = self.iden + d1_padded
-                if ind > len(d2):
-                    d2_padded = self.iden + d2_padded
-        return d1_padded, d2_padded
+        d1_pad = self.iden*(max_len - len(d1))
+        d2_pad = self.iden*(max_len - len(d2))
+        if end:
+            return d1 + d1_pad, d2 + d2_pad
+        return d1_pad + d1, d2_pad + d2
 
     def _base_subt_alg(self, d1, d2):
         '''Subtracts the second sequence of digits from the first for
@@ -184,51 +383,38 @@ class SifrSystem(object):
 
         Returns: [Subtracted sequence, next digit should be carried]'''
 
-        logging.debug("  ### START BASE SUBTRACT")
-        result = ''
+        if self.trace:
+            self._trace(logging.DEBUG, "  ### START BASE SUBTRACT")
 
         d1, d2 = self._pad_iden(d1, d2, end=False)
-        logging.debug("   Subtracting " + d2 + " from " + d1)
+        if self.trace:
+            self._trace(logging.DEBUG, "   Subtracting " + d2 + " from " + d1)
 
-        base_digit_range = range(1, len(d1)+1)
+        diff_table = self._diff_table
+        base = self.base_no
+        result = []
         carry = False
 
-        for digit in base_digit_range:
-            if len(d1) == 0:
-                break
-
-            d1_digit = d1[-1]
-            d1 = d1[:-1]
-
+        for d1_ind, d2_ind in zip(self._digit_indices(d1)[::-1],
+                                  self._digit_indices(d2)[::-1]):
             # If subtraction goes below base unit is subtracted
-            if carry:
-                d1_digit, dig_carry = self._incr_inv(d1_digit)
-                carry = True if dig_carry else False
-
-            # Subtract d2 digit if there are digits left
-            if len(d2) != 0:
-                logging.debug("   Subtract " + d2[-1] + " from " + d1_digit)
-                # Adds the digit to be added
-                for dig_seq in self.digit_list:
-                    if dig_seq == d2[-1]:
-                        d2 = d2[:-1]
-                        break
-                    d1_digit, dig_carry = self._incr_inv(d1_digit)
-                    carry = True if dig_carry else carry
-
-            logging.debug("   Result: " + d1_digit)
-            result = d1_digit + result
-            logging.debug("   New digit for step: " + result)
-
-        logging.info("   Final Base Subtract Result: " + result)
-        logging.debug("  ### END BASE SUBTRACT")
+            res_digit, carry = diff_table[base + d1_ind - d2_ind - carry]
+            result.append(res_digit)
+
+        result = ''.join(result[::-1])
+        if self.trace:
+            self._trace(logging.INFO,
+                        "   Final Base Subtract Result: " + result)
+            self._trace(logging.DEBUG, "  ### END BASE SUBTRACT")
         return result, carry
 
     def _dec_combine(self, d1, d2, arith_function):
-        logging.debug(" ### START DEC COMBINE")
+        if self.trace:
+            self._trace(logging.DEBUG, " ### START DEC COMBINE")
 
-        # Assigns number after identity in direction of alg provided
-        iden_next, _ = arith_function(self.iden, self.unit)
+        # Assigns number after identity in direction of alg provided (which
+        # only carries for subtraction, as in base two both give the unit)
+        iden_next, is_subt = arith_function(self.iden, self.unit)
 
         # Assigns the main number and xcimal from ordered numbers
 
@@ -239,16 +425,24 @@ class SifrSystem(object):
         xcimal1, xcimal2 = self._pad_iden(xcimal1, xcimal2)
 
         # Use the described arithmetic function to calculate
-        logging.debug("     Operating on xcimals: "
-                      + xcimal1 + " and " + xcimal2)
+        if self.trace:
+            self._trace(logging.DEBUG,
+                        "     Operating on xcimals: " + xcimal1 + " and " +
+                        xcimal2)
         xcimal, xc_carry = arith_function(xcimal1, xcimal2)
 
         zero_cross = False
-        logging.debug("       Operating on nums: " + num1 + " and " + num2)
+        if self.trace:
+            self._trace(logging.DEBUG,
+                        "       Operating on nums: " + num1 + " and " + num2)
 
         if xc_carry:
-            logging.debug("      Xcimal carries")
+            if self.trace:
+                self._trace(logging.DEBUG, "      Xcimal carries")
             num, temp_carry = arith_function(num1, self.unit)
+            if temp_carry and not is_subt:
+                # The carried unit is just the next digit of the sum
+                num, temp_carry = self.unit + num, False
             # Calculates extra digits to be put before answer to ensure correct
             # subtraction
             extra_digits = len(num2) - len(num) if len(num2) > len(num) else 0
@@ -256,16 +450,21 @@ class SifrSystem(object):
             num, carry = arith_function(num, num2)
             carry = temp_carry or carry
         else:
-            logging.debug("      Xcimal doesn't carry")
+            if self.trace:
+                self._trace(logging.DEBUG, "      Xcimal doesn't carry")
             num, carry = arith_function(num1, num2)
 
-        if carry and iden_next == self.unit:
+        if carry and not is_subt:
             # Only applies if addition
-            logging.debug("      Adding a unit to start for add")
+            if self.trace:
+                self._trace(logging.DEBUG,
+                            "      Adding a unit to start for add")
             result = self.unit + num + self.radix + xcimal
         elif carry:
-            logging.debug("      Zero is crossed so answer is subtracted " +
-                          "from zero")
+            if self.trace:
+                self._trace(logging.DEBUG,
+                            "      Zero is crossed so answer is subtracted " +
+                            "from zero")
             # Applies if negative and carry (therefore zero is crossed)
             diff_xcimal, diff_carry = arith_function(self.iden*len(xcimal),
                                                      xcimal)
@@ -275,11 +474,14 @@ class SifrSystem(object):
 
             result = diff_num + self.radix + diff_xcimal
             zero_cross = True
-            logging.debug("      Zero crossed")
+            if self.trace:
+                self._trace(logging.DEBUG, "      Zero crossed")
         else:
             result = num + self.radix + xcimal
 
-        logging.debug(" ### END DEC COMBINE: " + result.strip(self.iden))
+        if self.trace:
+            self._trace(logging.DEBUG,
+                        " ### END DEC COMBINE: " + result.strip(self.iden))
         return result.strip(self.iden), zero_cross
 
     def _raise_by_base(self, d, exp):
@@ -317,7 +519,8 @@ class SifrSystem(object):
 
     def knuth_up(self, d1, d2, algo, iden, quick_mul_mode=False):
         '''algo is add for multiply, and algo is multiply for exponentiation'''
-        logging.debug("   Start Knuth up")
+        if self.trace:
+            self._trace(logging.DEBUG, "   Start Knuth up")
         result = iden
 
         @mask_logging
@@ -326,145 +529,271 @@ class SifrSystem(object):
 
         # Loop through each xcimal to apply 'algo' that number of times
         fig_count = 0
-        logging.debug("     Applying algo provided " + d2 + " times")
+        if self.trace:
+            self._trace(logging.DEBUG,
+                        "     Applying algo provided " + d2 + " times")
         for d2_dig in d2[::-1]:
-            logging.debug("      Digit: " + d2_dig)
-            for dig in self.digit_list:
-                if dig == d2_dig:
-                    break
+            if self.trace:
+                self._trace(logging.DEBUG, "      Digit: " + d2_dig)
+            if quick_mul_mode and d2_dig != self.iden:
+                raised = _masked_raise_by_base(d1, fig_count)
+            for _ in range(self.digit_index[d2_dig]):
                 if quick_mul_mode:
-                    result = algo(result, _masked_raise_by_base(d1, fig_count))
+                    result = algo(result, raised)
                 else:
                     result = self._do_exp_base_times(fig_count,
                                                      result,
                                                      d1,
                                                      algo)
-                logging.debug("      Knuth running result: " + result)
+                if self.trace:
+                    self._trace(logging.DEBUG,
+                                "      Knuth running result: " + result)
             fig_count += 1
-        logging.debug("   End Knuth up")
+        if self.trace:
+            self._trace(logging.DEBUG, "   End Knuth up")
         return result
 
-    def _base_mul(self, d1, d2):
-        '''Multiplies two numbers together by repeatedly adding
-        ignoring negative signs (only provide magnitude)'''
+    def _limb_mul(self, a, b):
+        '''Multiplies two sequences of limbs (digit indices, least
+        significant first) as polynomials, i.e. without carrying. Uses
+        schoolbook multiplication for short sequences and Karatsuba above
+        the karatsuba_threshold of the system'''
+        if not a or not b:
+            return []
+        if min(len(a), len(b)) < self.karatsuba_threshold:
+            result = [0]*(len(a) + len(b) - 1)
+            for a_ind, a_limb in enumerate(a):
+                if a_limb:
+                    for b_ind, b_limb in enumerate(b):
+                        result[a_ind + b_ind] += a_limb * b_limb
+            return result
+
+        # Split both at the same power of the base: a = a0 + a1*b^half
+        half = max(len(a), len(b)) // 2
+        a0, a1 = a[:half], a[half:]
+        b0, b1 = b[:half], b[half:]
+
+        low = self._limb_mul(a0, b0)
+        high = self._limb_mul(a1, b1)
+        mid = self._limb_mul(self._limb_sum(a0, a1), self._limb_sum(b0, b1))
+        for ind, limb in enumerate(low):
+            mid[ind] -= limb
+        for ind, limb in enumerate(high):
+            mid[ind] -= limb
+
+        result = [0]*(len(a) + len(b) - 1)
+        for ind, limb in enumerate(low):
+            result[ind] += limb
+        for ind, limb in enumerate(mid[:len(result) - half]):
+            result[ind + half] += limb
+        for ind, limb in enumerate(high):
+            result[ind + 2*half] += limb
+        return result
 
-        logging.debug(" ### START BASE MULT")
+    @staticmethod
+    def _limb_sum(a, b):
+        '''Adds two sequences of limbs without carrying'''
+        if len(a) < len(b):
+            a, b = b, a
+        result = list(a)
+        for ind, limb in enumerate(b):
+            result[ind] += limb
+        return result
 
-        d1_num, d1_xcimal = self._dec_split(d1)
+    def _digit_mul(self, d1, d2):
+        '''Multiplies two sequences of digits (no separators)'''
+        product = self._limb_mul(self._digit_indices(d1)[::-1],
+                                 self._digit_indices(d2)[::-1])
+
+        # Carry the limbs back into digits of the base
+        base = self.base_no
+        digits = self.digit_list
+        result = []
+        carry = 0
+        for limb in product:
+            carry, ind = divmod(limb + carry, base)
+            result.append(digits[ind])
+        while carry:
+            carry, ind = divmod(carry, base)
+            result.append(digits[ind])
+        return ''.join(result[::-1]).lstrip(self.iden) or self.iden
 
-        logging.debug("  d1_num :" + d1_num)
-        logging.debug("  d1_xcimal: " + d1_xcimal)
+    def _base_mul(self, d1, d2):
+        '''Multiplies two numbers together digit by digit (schoolbook or
+        Karatsuba) ignoring negative signs (only provide magnitude)'''
 
-        @mask_logging
-        def full_add(x, y):
-            return self._dec_combine(x, y, self._base_add_alg)[0]
-
-        logging.debug("  Multiplying " + d2 + " by " + d1_num)
-        ans_num = self.knuth_up(d2,
-                                d1_num,
-                                full_add,
-                                self.iden,
-                                quick_mul_mode=True)
-        logging.debug("  Answer main number: " + ans_num)
-
-        logging.debug("  Multiplying " + d2 + " by " + d1_xcimal)
-        ans_xcimal = self.knuth_up(d2,
-                                   d1_xcimal,
-                                   full_add,
-                                   self.iden,
-                                   quick_mul_mode=True)
-        logging.debug("  Answer xcimal: " + ans_xcimal)
-
-        # Update ans xcimal with right xcimal point
-        ans_xc_num, ans_xc_xcimal = self._dec_split(ans_xcimal)
-
-        xc_reduce = len(d1_xcimal)
-        if xc_reduce >= len(ans_xc_num):
-            ans_xc_fin = (self.iden + self.radix
-                          + self.iden*(xc_reduce - len(ans_xc_num))
-                          + ans_xc_num + ans_xc_xcimal)
-        else:
-            ans_xc_fin = (ans_xc_num[:-xc_reduce] + self.radix
-                          + ans_xc_num[-xc_reduce:] + ans_xc_xcimal)
+        if self.trace:
+            self._trace(logging.DEBUG, " ### START BASE MULT")
 
-        logging.debug("  Answer xcimal reduced to add: " + ans_xc_fin)
+        d1_num, d1_xcimal = self._dec_split(d1)
+        d2_num, d2_xcimal = self._dec_split(d2)
 
-        multpd, _ = self._dec_combine(ans_num,
-                                      ans_xc_fin,
-                                      self._base_add_alg)
-        logging.debug(" ### END BASE MULT")
+        if self.trace:
+            self._trace(logging.DEBUG, "  Multiplying " + d2 + " by " + d1)
+        product = self._digit_mul(d1_num + d1_xcimal, d2_num + d2_xcimal)
+
+        # Place the xcimal point back by the xcimals of both numbers
+        xc_places = len(d1_xcimal) + len(d2_xcimal)
+        product = product.rjust(xc_places + 1, self.iden)
+        multpd = (product[:-xc_places] + self.radix
+                  + product[-xc_places:])
+        if self.trace:
+            self._trace(logging.DEBUG, "  Unrounded answer: " + multpd)
+            self._trace(logging.DEBUG, " ### END BASE MULT")
         return self.round(multpd, self.xcimal_places)
 
+    def _limb_short_div(self, u, divisor):
+        '''Divides limbs (least significant first) by a single integer
+        smaller than the base
+        Returns: [quotient limbs, remainder]'''
+        base = self.base_no
+        quot = [0]*len(u)
+        rem = 0
+        for ind in range(len(u) - 1, -1, -1):
+            quot[ind], rem = divmod(rem*base + u[ind], divisor)
+        return quot, rem
+
+    def _limb_divmod(self, u, v):
+        '''Long division of limbs (least significant first) using Knuth's
+        Algorithm D, estimating each quotient digit from the leading limbs
+        rather than counting how many times the divisor fits. The divisor
+        must have a non-zero leading limb.
+        Returns: [quotient limbs, remainder limbs]'''
+        base = self.base_no
+        n = len(v)
+        if len(u) < n:
+            return [0], list(u)
+        if n == 1:
+            quot, rem = self._limb_short_div(u, v[0])
+            return quot, [rem]
+
+        # Normalise so the leading limb of the divisor is at least half the
+        # base, which bounds the estimate to at most two above the digit
+        scale = base // (v[-1] + 1)
+        u = [limb * scale for limb in u] + [0]
+        v = [limb * scale for limb in v]
+        carry = 0
+        for ind in range(len(u)):
+            carry, u[ind] = divmod(u[ind] + carry, base)
+        for ind in range(n):
+            carry, v[ind] = divmod(v[ind] + carry, base)
+
+        v_top, v_next = v[-1], v[-2]
+        quot = [0]*(len(u) - n)
+        for j in range(len(u) - n - 1, -1, -1):
+            # Estimate the quotient digit from the top two limbs
+            q_hat, r_hat = divmod(u[j + n]*base + u[j + n - 1], v_top)
+            while q_hat >= base or q_hat*v_next > r_hat*base + u[j + n - 2]:
+                q_hat -= 1
+                r_hat += v_top
+                if r_hat >= base:
+                    break
+
+            # Multiply and subtract, adding back if the estimate was one over
+            carry = 0
+            for ind in range(n):
+                carry, u[ind + j] = divmod(u[ind + j] - q_hat*v[ind] + carry,
+                                           base)
+            top = u[j + n] + carry
+            if top < 0:
+                q_hat -= 1
+                carry = 0
+                for ind in range(n):
+                    carry, u[ind + j] = divmod(u[ind + j] + v[ind] + carry,
+                                               base)
+                top += carry
+            u[j + n] = top
+            quot[j] = q_hat
+
+        rem, _ = self._limb_short_div(u[:n], scale)
+        return quot, rem
+
+    def _limbs_to_digits(self, limbs):
+        '''Converts limbs (least significant first) to a sequence of digits
+        without leading identities'''
+        digits = self.digit_list
+        return (''.join(digits[limb] for limb in reversed(limbs))
+                .lstrip(self.iden) or self.iden)
+
+    def _digit_divmod(self, d1, d2):
+        '''Divides one sequence of digits (no separators) by another
+        Returns: [quotient digits, remainder digits]'''
+        u = self._digit_indices(d1.lstrip(self.iden))[::-1]
+        v = self._digit_indices(d2.lstrip(self.iden))[::-1]
+        if not v:
+            raise SifrScopeException("Zero Division Error")
+        quot, rem = self._limb_divmod(u, v)
+        return self._limbs_to_digits(quot), self._limbs_to_digits(rem)
+
     def _times_in_num(self, numer, denom):
-        logging.debug("    ##### ḂEGIN TIMES IN NUM COUNT")
-        logging.debug("     ##### Dividing " + numer + " by " + denom)
+        if self.trace:
+            self._trace(logging.DEBUG, "    ##### ḂEGIN TIMES IN NUM COUNT")
+            self._trace(logging.DEBUG,
+                        "     ##### Dividing " + numer + " by " + denom)
 
         if self._orderer(denom, self.iden)[1]:
             raise SifrScopeException("Zero Division Error")
 
-        unit = self.digit_list[1]
-        prod = self.iden
-        quot = self.iden
+        # Line up the xcimals so both can be divided as whole numbers
+        numer_num, numer_xcimal = self._dec_split(numer)
+        denom_num, denom_xcimal = self._dec_split(denom)
+        numer_xcimal, denom_xcimal = self._pad_iden(numer_xcimal,
+                                                    denom_xcimal)
+
+        quot, modulus = self._digit_divmod(numer_num + numer_xcimal,
+                                           denom_num + denom_xcimal)
+        xc_places = len(numer_xcimal)
+        modulus = modulus.rjust(xc_places + 1, self.iden)
+        modulus = (modulus[:-xc_places] + self.radix
+                   + modulus[-xc_places:])
+        if self.trace:
+            self._trace(logging.DEBUG, "     ##### Final quotient: " + quot)
+            self._trace(logging.DEBUG, "     ##### Remainder: " + modulus)
+            self._trace(logging.DEBUG, "    ##### END TIMES IN NUM COUNT")
+        return quot, self._norm_ans(modulus)
 
-        @mask_logging
-        def full_add(x, y):
-            result = self._dec_combine(x, y, self._base_add_alg)
-            return result[0]
-
-        @mask_logging
-        def full_subt(x, y):
-            result = self._dec_combine(x, y, self._base_subt_alg)
-            return result[0]
+    def _base_div(self, numer, denom):
+        if self.trace:
+            self._trace(logging.INFO, " ### START BASE DIV")
+            self._trace(logging.INFO, "  # Dividing " + numer + " by " + denom)
 
-        while True:
-            logging.debug("      ##### Running quot: " + quot)
-            logging.debug("      ##### Running tally: " + prod)
-            new_prod = full_add(prod, denom)
-            new_quot = full_add(quot, unit)
-            if self._orderer(new_prod, numer)[0]:
-                break
-            prod = new_prod
-            quot = new_quot
-        logging.debug("     ##### Final quotient: " + quot)
-        logging.debug("     ##### Final product: " + prod)
-        modulus = full_subt(numer, prod)
-        logging.debug("     ##### Remainder: " + prod)
-        logging.debug("    ##### END TIMES IN NUM COUNT")
-        return quot.split(self.radix)[0], self._norm_ans(modulus)
+        if self._orderer(denom, self.iden)[1]:
+            raise SifrScopeException("Zero Division Error")
 
-    def _base_div(self, numer, denom):
-        logging.info(" ### START BASE DIV")
-        logging.info("  # Dividing " + numer + " by " + denom)
-
-        # @mask_logging
-        def lil_div(num, den):
-            return self._times_in_num(num, den)
-
-        mod_zero = False
-        xcim_count = 1
-        first_div, modls = lil_div(numer, denom)
-        divd = first_div + self.radix
-        logging.debug("  Main number: " + divd)
-        logging.debug("  Modulus to be divided in xcimal: " + modls)
-
-        while not mod_zero and xcim_count <= self.xcimal_places + 1:
-            logging.debug("   # New decimal")
-            m_quot, modls = lil_div(self._raise_by_base(modls, 1), denom)
-            mod_zero = self._orderer(modls, self.iden)[1]
-            divd += m_quot
-            xcim_count += 1
-            logging.debug("   Extra xcimal: " + m_quot
-                          + " Xcimal count: " + str(xcim_count - 1))
-            logging.debug("   Modulus: " + self._norm_ans(modls))
-
-        xcim_count -= 1  # Revert previous increment
-
-        if xcim_count == self.xcimal_places + 1:
-            divd = self.round(divd, self.xcimal_places)
-        logging.info(" ### END BASE DIV")
+        numer_num, numer_xcimal = self._dec_split(numer)
+        denom_num, denom_xcimal = self._dec_split(denom)
+        numer_xcimal, denom_xcimal = self._pad_iden(numer_xcimal,
+                                                    denom_xcimal)
+
+        # Divide to one xcimal place past the precision to round from it
+        places = self.xcimal_places + 1
+        divd, _ = self._digit_divmod(numer_num + numer_xcimal
+                                     + self.iden*places,
+                                     denom_num + denom_xcimal)
+        divd = divd.rjust(places + 1, self.iden)
+        divd = divd[:-places] + self.radix + divd[-places:]
+        if self.trace:
+            self._trace(logging.DEBUG, "  Unrounded answer: " + divd)
+
+        divd = self.round(divd, self.xcimal_places)
+        if self.trace:
+            self._trace(logging.INFO, " ### END BASE DIV")
         return self._norm_ans(divd)
 
+    def _exp_work_places(self, whole, exp_num):
+        '''Xcimal places to carry while raising a number with the given whole
+        part to exp_num, so that truncating the intermediate products does
+        not reach the final rounding: the precision of the system, the digits
+        the whole part grows by and guard digits for the multiplications'''
+        log_base = math.log2(self.base_no)
+        whole_digits = math.ceil(whole.bit_length() * exp_num / log_base)
+        guard_digits = 2 * math.ceil(exp_num.bit_length() / log_base) + 2
+        return self.xcimal_places + whole_digits + guard_digits
+
+    @memoized
     def _int_exp(self, base, exp):
+        '''Raises a number to an integer power by squaring, carrying guard
+        digits through the products and rounding once at the end'''
         exp_num, exp_xcim = self._dec_split(exp)
         if self._orderer(exp_xcim, self.iden)[0]:
             raise SifrScopeException("Exponentiation only implemented " +
@@ -476,13 +805,38 @@ class SifrSystem(object):
             raise SifrScopeException("Undefined Error: Zero to the power of " +
                                      "zero is undefined")
 
+        if self.trace:
+            self._trace(logging.DEBUG, "Base: " + base + " Exp: " + exp)
         base_num, base_xcim = self._dec_split(base)
-
-        @mask_logging
-        def full_mult(x, y):
-            return self._base_mul(x, y)
-        logging.debug("Base: " + base + " Exp: " + exp)
-        return self.knuth_up(base, exp_num, full_mult, self.unit)
+        exp_int = self._digits_to_int(exp_num)
+        work_places = self._exp_work_places(self._digits_to_int(base_num),
+                                            exp_int)
+
+        def trunc_mul(x, y):
+            # Multiplies (digits, xcimal places) pairs dropping the digits
+            # past the working places
+            digits = self._digit_mul(x[0], y[0])
+            places = x[1] + y[1]
+            if places > work_places:
+                keep = max(len(digits) - (places - work_places), 0)
+                digits = digits[:keep] or self.iden
+                places = work_places
+            return digits, places
+
+        result = (self.unit, 0)
+        square = (base_num + base_xcim, len(base_xcim))
+        while exp_int:
+            if exp_int & 1:
+                result = trunc_mul(result, square)
+            exp_int >>= 1
+            if exp_int:
+                square = trunc_mul(square, square)
+
+        digits, places = result
+        digits = digits.rjust(places + 1, self.iden)
+        result = (digits[:len(digits) - places] + self.radix
+                  + digits[len(digits) - places:])
+        return self.round(result, self.xcimal_places)
 
     def _num_compare(self, d1, d2):
         ''' Compare digits magnitude, without xcimal separator
@@ -496,27 +850,13 @@ class SifrSystem(object):
         else:
             longer_no = 'd2'
 
-        for dig_ind in range(min(len(d1), len(d2))):
-            equal = False
-            for dig in self.digit_list[::-1]:
-                if d1[dig_ind] == dig and d2[dig_ind] == dig:
-                    equal = True
-                    to_break = False
-                    break
-                elif d1[dig_ind] == dig:
-                    greater = True
-                    equal = False
-                    to_break = True
-                    break
-                elif d2[dig_ind] == dig:
-                    greater = False
-                    equal = False
-                    to_break = True
-                    break
-                else:
-                    to_break = False
-
-            if to_break:
+        equal = True
+        greater = False
+        for d1_ind, d2_ind in zip(self._digit_indices(d1),
+                                  self._digit_indices(d2)):
+            if d1_ind != d2_ind:
+                greater = d1_ind > d2_ind
+                equal = False
                 break
 
         # Return result of equal or d1 greater than d2
@@ -548,7 +888,8 @@ class SifrSystem(object):
             greater, equal = self._num_compare(d1_num, d2_num)
             if equal:
                 greater, equal = self._num_compare(d1_xcimal, d2_xcimal)
-        logging.debug(" ### ORDERER RUN")
+        if self.trace:
+            self._trace(logging.DEBUG, " ### ORDERER RUN")
         return greater, equal
 
     def round(self, num, round_level):
@@ -557,19 +898,27 @@ class SifrSystem(object):
 
     def round_half_to_inf(self, num, round_level):
         '''Rounds a non-negative number to the given number of xcimal places'''
-        logging.info(" ### START HALF-TO-INF ROUNDING ")
+        if self.trace:
+            self._trace(logging.INFO, " ### START HALF-TO-INF ROUNDING ")
         main_no, xcimal_no = self._dec_split(num)
         if not len(xcimal_no) <= round_level:
-            logging.debug("    Number to be rounded")
+            if self.trace:
+                self._trace(logging.DEBUG, "    Number to be rounded")
             rounded_xcimal = xcimal_no[:round_level]
             next_num = xcimal_no[round_level]  # Takes number after round limit
-            if next_num in self.digit_list[round(len(self.digit_list) / 2
-                                                 + 0.1):]:
-                # Above 0.1 is to ensure ceiling round of half
-                logging.debug("     Number after limit is in upper range "
-                              + "of digit list, round up")
-                rounded_xcimal, xcim_carry = self._base_add_alg(rounded_xcimal,
-                                                                self.unit)
+            if self.digit_index[next_num] >= self._round_up_index:
+                # Index is precomputed with 0.1 above half to ensure ceiling
+                # round of half
+                if self.trace:
+                    self._trace(logging.DEBUG,
+                                "     Number after limit is in upper range " +
+                                "of digit list, round up")
+                if rounded_xcimal:
+                    rounded_xcimal, xcim_carry = self._base_add_alg(
+                        rounded_xcimal, self.unit)
+                else:
+                    # Rounding to a whole number carries straight into it
+                    xcim_carry = True
                 if xcim_carry:
                     main_no, main_carry = self._base_add_alg(main_no,
                                                              self.unit)
@@ -581,14 +930,20 @@ class SifrSystem(object):
                 else:
                     rounded = main_no + self.radix + rounded_xcimal
             else:
-                logging.debug("     Number after limit is on lower range of "
-                              + "digit list, round down")
+                if self.trace:
+                    self._trace(logging.DEBUG,
+                                "     Number after limit is on lower range " +
+                                "of digit list, round down")
                 rounded = main_no + self.radix + rounded_xcimal
         else:
-            logging.debug("    Number already in rounding bounds")
+            if self.trace:
+                self._trace(logging.DEBUG,
+                            "    Number already in rounding bounds")
             rounded = num
-        logging.info(" ### END HALF-TO-INF ROUNDING: "
-                     + self._norm_ans(rounded))
+        if self.trace:
+            self._trace(logging.INFO,
+                        " ### END HALF-TO-INF ROUNDING: " +
+                        self._norm_ans(rounded))
         return self._norm_ans(rounded)
 
     def _norm_ans(self, raw_ans: str):
@@ -630,3 +985,301 @@ class SifrSystem(object):
             norm_ans = self.iden + self.radix + self.iden
 
         return norm_ans
+
+    # Numeric form
+    # A sifr string can also be held as a sign, an integer mantissa and the
+    # number of xcimal places (the radix exponent), so that the value is
+    # mantissa * base^-places. The methods below operate on this form and,
+    # as with the string algorithms, only deal with magnitudes.
+
+    def _int_power(self, exp):
+        '''Cached power of the base used to split digit conversions'''
+        try:
+            return self._int_powers[exp]
+        except KeyError:
+            result = self._int_powers[exp] = self.base_no**exp
+            return result
+
+    def _digits_to_int(self, d):
+        '''Converts a sequence of digits (no separators) to the integer it
+        represents in the base of the system'''
+        if not self._digit_set.issuperset(d):
+            raise Exception("Digit not in list and thus different " +
+                            "numbering system")
+        return self._split_digits_to_int(d)
+
+    def _split_digits_to_int(self, d):
+        if len(d) <= self.conversion_threshold:
+            if not d:
+                return 0
+            if self._to_std is not None:
+                return int(d.translate(self._to_std), self.base_no)
+            base = self.base_no
+            result = 0
+            for ind in self._digit_indices(d):
+                result = result * base + ind
+            return result
+
+        # Split at the threshold times a power of two, so the powers of the
+        # base are shared between conversions
+        split = self.conversion_threshold
+        while 2*split < len(d):
+            split *= 2
+        return (self._split_digits_to_int(d[:-split])
+                * self._int_power(split)
+                + self._split_digits_to_int(d[-split:]))
+
+    def _int_to_digits(self, n):
+        '''Converts a non-negative integer to its sequence of digits'''
+        if n == 0:
+            return self.iden
+        return self._split_int_to_digits(n, 0)
+
+    def _split_int_to_digits(self, n, width):
+        '''Digits of a non-negative integer padded with identities to the
+        given width'''
+        split = self.conversion_threshold
+        if n < self._int_power(split):
+            if self._std_format is not None:
+                result = (format(n, self._std_format)
+                          .translate(self._from_std))
+            else:
+                base = self.base_no
+                digits = self.digit_list
+                result = []
+                while n:
+                    n, ind = divmod(n, base)
+                    result.append(digits[ind])
+                result = ''.join(result[::-1])
+            return result.rjust(width, self.iden)
+
+        while self._int_power(2*split) <= n:
+            split *= 2
+        high, low = divmod(n, self._int_power(split))
+        return (self._split_int_to_digits(high, width - split)
+                + self._split_int_to_digits(low, split))
+
+    def _to_num(self, d):
+        '''Converts a sifr string to its numeric form
+        Returns: [is negative, mantissa, xcimal places]'''
+        d = d.strip()
+        is_neg = d[:1] == self.neg_sym
+        if is_neg:
+            d = d[1:]
+        d_parts = d.split(self.radix)
+        d_num = d_parts[0]
+        d_xcimal = '' if len(d_parts) == 1 else d_parts[1].rstrip(self.iden)
+        mant = self._digits_to_int(d_num + d_xcimal)
+        return is_neg and mant != 0, mant, len(d_xcimal)
+
+    def _from_num(self, is_neg, mant, exp):
+        '''Converts the numeric form to a normalised sifr string (the same
+        form as returned by _norm_ans)'''
+        digits = self._int_to_digits(mant).rjust(exp + 1, self.iden)
+        split = len(digits) - exp
+        d_xcimal = digits[split:].rstrip(self.iden) or self.iden
+        result = digits[:split] + self.radix + d_xcimal
+        if is_neg and mant != 0:
+            result = self.neg_sym + result
+        return result
+
+    def _num_align(self, m1, e1, m2, e2):
+        '''Scales the mantissas to the same number of xcimal places
+        Returns: [mantissa 1, mantissa 2, xcimal places]'''
+        if e1 < e2:
+            return m1 * self.base_no**(e2 - e1), m2, e2
+        elif e1 > e2:
+            return m1, m2 * self.base_no**(e1 - e2), e1
+        return m1, m2, e1
+
+    def _num_round(self, mant, exp, round_level):
+        round_function = self.NUM_ROUNDING_FUNCTIONS[self.round_type]
+        return round_function(mant, exp, round_level)
+
+    def _num_round_half_to_inf(self, mant, exp, round_level):
+        '''Rounds a mantissa to the given number of xcimal places using the
+        same rule as round_half_to_inf (only the digit after the rounding
+        limit is considered)'''
+        if exp <= round_level:
+            return mant, exp
+        base = self.base_no
+        rounded, rest = divmod(mant, base**(exp - round_level))
+        next_ind = rest // base**(exp - round_level - 1)
+        if next_ind >= self._round_up_index:
+            rounded += 1
+        return rounded, round_level
+
+    def _num_mul(self, m1, e1, m2, e2):
+        '''Multiplies two magnitudes rounding to the xcimal places of the
+        system'''
+        return self._num_round(m1 * m2, e1 + e2, self.xcimal_places)
+
+    def _int_reciprocal(self, d, prec):
+        '''Approximates 2^(bits of d + prec) // d to within a few units by
+        Newton iteration, doubling the precision from a low precision
+        estimate at each step'''
+        guard = 32
+        d_bits = d.bit_length()
+        if prec <= max(4*guard, self.newton_threshold // 8):
+            return (1 << (d_bits + prec)) // d
+
+        # Reciprocal of the leading digits to just over half the precision
+        half = prec // 2 + guard
+        shift = max(0, d_bits - half - guard)
+        approx = self._int_reciprocal(d >> shift, half) << (prec - half)
+
+        # One Newton step: x + x(1 - dx)
+        error = (1 << (d_bits + prec)) - d * approx
+        return approx + ((approx * error) >> (d_bits + prec))
+
+    def _int_divmod(self, n, d):
+        '''Integer division with remainder, switching to multiplication by a
+        Newton reciprocal when the divisor and quotient are both above
+        newton_threshold bits'''
+        guard = 32
+        d_bits = d.bit_length()
+        quot_bits = n.bit_length() - d_bits + 1
+        if min(d_bits, quot_bits) < self.newton_threshold:
+            return divmod(n, d)
+
+        # Only the leading digits of the divisor matter to the estimate
+        prec = quot_bits + guard
+        shift = max(0, d_bits - prec - guard)
+        recip = self._int_reciprocal(d >> shift, prec)
+        quot = ((n >> shift) * recip) >> (d_bits - shift + prec)
+
+        # Correct the estimate (only ever off by a few units)
+        correction, rem = divmod(n - quot * d, d)
+        return quot + correction, rem
+
+    def _int_sqrt(self, n):
+        '''Floor of the square root of a non-negative integer by Newton
+        iteration, starting from the root of the leading bits and doubling
+        the number of correct bits at each step'''
+        if n < 0:
+            raise SifrScopeException("Undefined Error: Square root of a " +
+                                     "negative number")
+        if n == 0:
+            return 0
+        top = (n.bit_length() - 1) // 2
+        root, bits = 1, 0
+        for step in reversed(range(top.bit_length())):
+            prev_bits, bits = bits, top >> step
+            quot, _ = self._int_divmod(n >> (2*top - prev_bits - bits + 1),
+                                       root)
+            root = (root << (bits - prev_bits - 1)) + quot
+        return root - 1 if root * root > n else root
+
+    def _int_root(self, n, k):
+        '''Floor of the kth root of a non-negative integer by Newton
+        iteration from above, starting from the root of the leading half of
+        the digits (worked out the same way) so few full steps are needed'''
+        if k == 2:
+            return self._int_sqrt(n)
+        if n == 0:
+            return 0
+        if n < 2**64:
+            root = int(n ** (1.0 / k)) + 1
+        else:
+            shift = n.bit_length() // (2*k)
+            root = (self._int_root(n >> (k * shift), k) + 1) << shift
+
+        # Steps down towards the root, stopping once it no longer falls
+        while True:
+            quot, _ = self._int_divmod(n, root**(k - 1))
+            next_root = ((k - 1) * root + quot) // k
+            if next_root >= root:
+                break
+            root = next_root
+        while root**k > n:
+            root -= 1
+        return root
+
+    def _num_root(self, mant, exp, k):
+        '''kth root of a magnitude worked out (truncated) to one xcimal
+        place past the precision of the system and rounded from it'''
+        places = self.xcimal_places + 1
+        shift = k * places - exp
+        if shift >= 0:
+            scaled = mant * self.base_no**shift
+        else:
+            scaled = mant // self.base_no**-shift
+        root = self._int_root(scaled, k)
+        return self._num_round(root, places, self.xcimal_places)
+
+    def _num_divmod(self, m1, e1, m2, e2):
+        '''Number of times the second magnitude fits in the first and what
+        is left over
+        Returns: [quotient, remainder mantissa, remainder xcimal places]'''
+        if m2 == 0:
+            raise SifrScopeException("Zero Division Error")
+        m1, m2, exp = self._num_align(m1, e1, m2, e2)
+        quot, rem = self._int_divmod(m1, m2)
+        return quot, rem, exp
+
+    def _num_from_ratio(self, numer, denom):
+        '''Numeric form of a ratio of non-negative integers, divided to one
+        xcimal place past the precision of the system and rounded back from
+        it as with _base_div'''
+        if denom == 1:
+            return numer, 0
+        places = self.xcimal_places + 1
+        quot, _ = self._int_divmod(numer * self.base_no**places, denom)
+        return self._num_round(quot, places, self.xcimal_places)
+
+    def _num_truncated_ratio(self, numer, denom):
+        '''Numeric form of a ratio of non-negative integers truncated to
+        the xcimal places of the system (for working values that are
+        rounded once more, from the digit after the places they are
+        rounded to)'''
+        places = self.xcimal_places
+        quot, _ = self._int_divmod(numer * self.base_no**places, denom)
+        return quot, places
+
+    def _num_div(self, m1, e1, m2, e2):
+        '''Divides two magnitudes to the precision of the system'''
+        if m2 == 0:
+            raise SifrScopeException("Zero Division Error")
+        return self._num_from_ratio(m1 * self.base_no**e2,
+                                    m2 * self.base_no**e1)
+
+    def _num_truncate(self, mant, exp, places):
+        '''Drops the digits of a magnitude past the given xcimal places'''
+        if exp <= places:
+            return mant, exp
+        return mant // self.base_no**(exp - places), places
+
+    @memoized
+    def _num_int_exp(self, base_m, base_e, exp_m, exp_e):
+        '''Raises a magnitude to a (non-negative) integer exponent by
+        squaring, carrying guard digits and rounding once at the end'''
+        exp_num, exp_xcim = divmod(exp_m, self.base_no**exp_e)
+        if exp_xcim != 0:
+            raise SifrScopeException("Exponentiation only implemented " +
+                                     "for integers at this point")
+        if base_m == 0 and exp_num == 0:
+            raise SifrScopeException("Undefined Error: Zero to the power of " +
+                                     "zero is undefined")
+        if base_e == 0:
+            return base_m**exp_num, 0
+
+        work_places = self._exp_work_places(base_m // self.base_no**base_e,
+                                            exp_num)
+        result_m, result_e = 1, 0
+        square_m, square_e = base_m, base_e
+        while exp_num:
+            if exp_num & 1:
+                result_m, result_e = self._num_truncate(result_m * square_m,
+                                                        result_e + square_e,
+                                                        work_places)
+            exp_num >>= 1
+            if exp_num:
+                square_m, square_e = self._num_truncate(square_m * square_m,
+                                                        2 * square_e,
+                                                        work_places)
+        return self._num_round(result_m, result_e, self.xcimal_places)
+
+    def _num_whole(self, mant, exp):
+        '''Splits a magnitude into its whole number and the mantissa of what
+        is left in the xcimals'''
+        return divmod(mant, self.base_no**exp)
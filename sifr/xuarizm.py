@@ -5,158 +5,562 @@
 # calculating arithmetic (and geometric in the future) series using a given
 # function calculated until it converges to the precision given by the
 # SifrSystem
+# Series whose consecutive terms have a rational ratio (hypergeometric-like
+# series such as those for e and pi) can instead be summed by binary
+# splitting, which combines the terms as exact integer products and only
+# divides once at the end.
 # #############################################################################
 
+import concurrent.futures
+import functools
 import logging
+import math
 
-from sifr import Sifr
-
-from sifr.systems import SifrSystem
-
-logging.getLogger().setLevel(logging.WARNING)
+from sifr.systems import SifrSystem, SifrScopeException, mask_logging
+from sifr.sifr import Sifr
+from sifr.cache import constant_cache
 
 
 # DECORATORS
-def mask_logging(func):
+def cached_constant(name):
+    '''Takes the constant from the cache of the Constants when no upper
+    bound is given (working it out and caching it if it isn't there) and
+    rounds it to the precision of the system'''
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, upper_bound=None):
+            if self.cache is None or upper_bound is not None:
+                return self.ssys.convert(func(self, upper_bound))
+            key = (name, self.wsys.digit_list, self.wsys.xcimal_places)
+            num = self.cache.get(*key)
+            if num is None:
+                value = func(self, None)
+                num = (value.is_neg, value._mant, value._exp)
+                self.cache.put(*key, num)
+            elif self.ssys.trace:
+                self.ssys._trace(logging.DEBUG,
+                                 "Constant " + name + " taken from cache")
+            # Rounded here as the cached value can be of more places than
+            # the working system (and convert leaves a Sifr of the same
+            # system as it is, which the working system is without guard
+            # digits)
+            mant, exp = self.ssys._num_round(num[1], num[2],
+                                             self.ssys.xcimal_places)
+            return Sifr._from_num(num[0], mant, exp, self.ssys)
+        return wrapper
+    return decorator
+
+
+def _whole_number(n):
+    '''Python integer of a Sifr that has to be a whole number'''
+    whole, xcim = n.ssys._num_whole(n._mant, n._exp)
+    if xcim != 0:
+        raise SifrScopeException("Only implemented for whole numbers")
+    return -whole if n.is_neg else whole
+
+
+def memoized_formula(func):
+    '''Serves repeated calls of the formula from the memo of the system of
+    its (whole number) operands when it is switched on'''
+    @functools.wraps(func)
     def wrapper(*args):
-        prev_log_level = logging.root.level
-        logging.getLogger().setLevel(logging.ERROR)
-        result = func(*args)
-        logging.getLogger().setLevel(prev_log_level)
-        return result
+        ssys = args[0].ssys
+        if ssys.memo is None:
+            return func(*args)
+        key = (func.__name__, ssys.xcimal_places) + \
+            tuple(_whole_number(arg) for arg in args)
+        return ssys.memo.get_or_compute(key, lambda: func(*args))
     return wrapper
 
 
 class Formulae(object):
     @staticmethod
-    def factorial(n):
-        logging.debug("### START FACTORIAL")
-        ssys = n.ssys
-        unit = Sifr(ssys.unit, ssys)
-        result = Sifr(ssys.unit, ssys)
-        while n != Sifr(ssys.iden, ssys):
-            result *= n
-            n -= unit
-        logging.debug("### END FACTORIAL: " + result.sifr)
-        return result
-
-
-class Constants(object):
-    def __init__(self, sifr_system):
-        self.ssys = sifr_system
-
-    def return_leibniz_pi(self, upper_bound):
-        s = self.ssys
-        zero = Sifr(s.iden, s)
-        one = Sifr(s.unit, s)
-        two = one + one
-        four = two + two
+    def _fibonacci_pair(k):
+        '''F(k) and F(k+1) of a non-negative integer by fast doubling:
+        F(2k) = F(k)(2F(k+1) - F(k)) and F(2k+1) = F(k)^2 + F(k+1)^2'''
+        fib, fib_next = 0, 1
+        for bit in bin(k)[2:]:
+            fib, fib_next = (fib * (2*fib_next - fib),
+                             fib * fib + fib_next * fib_next)
+            if bit == '1':
+                fib, fib_next = fib_next, fib + fib_next
+        return fib, fib_next
 
-        @mask_logging
-        def pi_algo(k):
-            if k % two == zero:
-                return four / (two * k + one)
-            else:
-                return -four / (two * k + one)
-        return Xuarizm(pi_algo, s, upper_bound=upper_bound).arith_series()
-
-    def return_bbp_pi(self, upper_bound):
-        s = self.ssys
-        one = Sifr(s.unit, s)
-        two = one + one
-        four = two + two
-        five = four + one
-        six = four + two
-        eight = four + four
-        sixteen = eight + eight
-
-        def pi_algo(k):
-            return (one / (sixteen ** k)) * ((four / (eight * k + one))
-                                             - (two / (eight * k + four))
-                                             - (one / (eight * k + five))
-                                             - (one / (eight * k + six)))
-
-        return Xuarizm(pi_algo, s, upper_bound=upper_bound).arith_series()
-
-    def return_fibonacci_phi(self, upper_bound):
-        logging.debug("Calculating Phi using Fibonacci sequence")
-
-        @mask_logging
-        def masked_le(x, y):
-            return x <= y
-
-        @mask_logging
-        def masked_div(x, y):
-            return x / y
-
-        @mask_logging
-        def masked_add(x, y):
-            return x + y
+    @staticmethod
+    @memoized_formula
+    def fibonacci(n):
+        '''nth Fibonacci number (extended to negative n by
+        F(-n) = (-1)^(n+1) F(n))'''
+        ssys = n.ssys
+        if ssys.trace:
+            ssys._trace(logging.DEBUG, "### START FIBONACCI")
+        k = _whole_number(n)
+        fib, _ = Formulae._fibonacci_pair(abs(k))
+        if k < 0 and k % 2 == 0:
+            fib = -fib
+        if ssys.trace:
+            ssys._trace(logging.DEBUG, "### END FIBONACCI")
+        return ssys.from_int(fib)
 
-        unit = Sifr(self.ssys.unit, self.ssys)
-        fib_old = unit
-        fib_new = unit
+    @staticmethod
+    def _product(low, high, step=1):
+        '''Product of low, low + step, ... up to high (inclusive) by a
+        balanced product tree, so the large multiplications are of numbers
+        of about the same size'''
+        count = (high - low) // step + 1
+        if count <= 0:
+            return 1
+        if count <= 8:
+            result = 1
+            for k in range(low, high + 1, step):
+                result *= k
+            return result
+        mid = low + (count // 2) * step
+        return (Formulae._product(low, mid - step, step) *
+                Formulae._product(mid, high, step))
 
-        counter = unit
+    @staticmethod
+    def _primes(n):
+        '''Primes up to n by the sieve of Eratosthenes'''
+        sieve = bytearray([1]) * (n + 1)
+        sieve[:2] = b'\x00\x00'
+        for k in range(2, int(n**0.5) + 1):
+            if sieve[k]:
+                sieve[k*k::k] = bytearray(len(range(k*k, n + 1, k)))
+        return [k for k in range(n + 1) if sieve[k]]
 
-        while masked_le(counter, upper_bound):
-            logging.debug(" Term no: " + counter.sifr)
-            fib_prev = fib_old
-            fib_old = fib_new
-            fib_new = masked_add(fib_prev, fib_old)
-            counter = masked_add(counter, unit)
+    @staticmethod
+    def _swing(n, primes):
+        '''Swinging factorial n!/((n//2)!)^2 from its prime factors'''
+        factors = []
+        for p in primes:
+            if p > n:
+                break
+            power, q = 1, n
+            while q >= p:
+                q //= p
+                if q & 1:
+                    power *= p
+            if power > 1:
+                factors.append(power)
+        return Formulae._tree(factors)
 
-        logging.debug(" Prior ratio for reference: "
-                      + masked_div(fib_old,
-                                   fib_prev).sifr)
-        phi = masked_div(fib_new, fib_old)
-        logging.debug("Phi Estimate: " + phi.sifr)
+    @staticmethod
+    def _tree(factors):
+        '''Product of a list of integers by a balanced product tree'''
+        while len(factors) > 1:
+            paired = [factors[k] * factors[k + 1]
+                      for k in range(0, len(factors) - 1, 2)]
+            if len(factors) % 2:
+                paired.append(factors[-1])
+            factors = paired
+        return factors[0] if factors else 1
 
-        return phi
+    @staticmethod
+    def _int_factorial(n, primes=None):
+        '''n! of a Python integer by the prime swing recursion
+        n! = ((n//2)!)^2 swing(n)'''
+        if n < 32:
+            return Formulae._product(2, n)
+        if primes is None:
+            primes = Formulae._primes(n)
+        half = Formulae._int_factorial(n // 2, primes)
+        return half * half * Formulae._swing(n, primes)
 
-    def return_arith_phi(self, upper_bound):
-        s = self.ssys
-        fact = Formulae.factorial
+    @staticmethod
+    @memoized_formula
+    def factorial(n):
+        ssys = n.ssys
+        if ssys.trace:
+            ssys._trace(logging.DEBUG, "### START FACTORIAL")
+        k = _whole_number(n)
+        if k < 0:
+            raise SifrScopeException("Undefined Error: Factorial of a " +
+                                     "negative number")
+        result = ssys.from_int(Formulae._int_factorial(k))
+        if ssys.trace:
+            ssys._trace(logging.DEBUG, "### END FACTORIAL: " + result.sifr)
+        return result
 
-        one = Sifr(s.unit, s)
-        two = one + one
-        three = two + one
-        four = two + two
-        six = four + two
-        eight = four + four
-        thirteen = six + six + one
+    @staticmethod
+    @memoized_formula
+    def double_factorial(n):
+        '''n!! = n(n-2)(n-4)... (with 0!! = (-1)!! = 1)'''
+        ssys = n.ssys
+        k = _whole_number(n)
+        if k < -1:
+            raise SifrScopeException("Double factorial only implemented " +
+                                     "from -1 upwards")
+        return ssys.from_int(Formulae._product(2 - k % 2, k, 2))
 
-        def phi_algo(k):
-            return (((-one)**(k + one) * fact(two * k + one)) /
-                    (fact(k + two) * fact(k) * four**(two * k + three)))
+    @staticmethod
+    @memoized_formula
+    def binomial(n, k):
+        '''Number of ways of choosing k of n (zero where k is out of
+        range)'''
+        ssys = n.ssys
+        n_int, k_int = _whole_number(n), _whole_number(k)
+        if n_int < 0:
+            raise SifrScopeException("Binomial only implemented for " +
+                                     "non-negative n")
+        if k_int < 0 or k_int > n_int:
+            return ssys.zero
+        k_int = min(k_int, n_int - k_int)
+        numer = Formulae._product(n_int - k_int + 1, n_int)
+        quot, _ = ssys._int_divmod(numer, Formulae._int_factorial(k_int))
+        return ssys.from_int(quot)
+
+
+# Terms of the series of the Constants, defined at the top level (rather than
+# inside the methods) so they can be pickled to worker processes
+def _unit(k):
+    return 1
+
+
+def _e_q(k):
+    # Each term of the sum of 1/k! is the one before divided by k
+    return max(k, 1)
+
+
+# The four fractions of each BBP term over a common denominator, with each
+# term a sixteenth of the one before
+def _bbp_a(k):
+    return 120*k**2 + 151*k + 47
+
+
+def _bbp_b(k):
+    return 512*k**4 + 1024*k**3 + 712*k**2 + 194*k + 15
+
+
+def _bbp_q(k):
+    return 16 if k > 0 else 1
+
+
+# BBP digit extraction, where pi = 4 S(1) - 2 S(4) - S(5) - S(6) with
+# S(j) = sum_i 1 / (16^i (8i + j)), so the bits of pi from any position on
+# come from the fractional parts of 2^m S(j) without the bits before them
+def _bbp_frac_sum(j, m, bits):
+    '''Fractional part of 2^m S(j) times 2^bits (truncated) and a bound on
+    the units lost to truncating its terms'''
+    total, i = 0, 0
+    # Terms with 4i <= m are taken modulo 8i + j as their whole part drops
+    while 4*i <= m:
+        denom = 8*i + j
+        total += (pow(2, m - 4*i, denom) << bits) // denom
+        i += 1
+    # and the rest are less than one, up to where they truncate to nothing
+    # (past which they come to less than two units)
+    units = i + 2
+    shift = bits + m - 4*i
+    while shift >= 0:
+        term = (1 << shift) // (8*i + j)
+        if term == 0:
+            break
+        total += term
+        units += 1
+        i += 1
+        shift -= 4
+    return total % (1 << bits), units
+
+
+def _bbp_pi_bits(m, bits):
+    '''Fractional part of 2^m pi times 2^bits and a bound on its error in
+    units'''
+    total, units = 0, 0
+    for j, coeff in ((1, 4), (4, -2), (5, -1), (6, -1)):
+        frac, frac_units = _bbp_frac_sum(j, m, bits)
+        total += coeff * frac
+        units += abs(coeff) * frac_units
+    return total % (1 << bits), units
+
+
+def _bbp_pi_digits(m, count, digit_bits):
+    '''The count digits (of digit_bits bits each) of pi starting m bits
+    after the point, as numbers. Guard bits are added until the error bound
+    can't change the digits'''
+    guard = 2 * (m + 1).bit_length() + 16
+    while True:
+        bits = count * digit_bits + guard
+        frac, units = _bbp_pi_bits(m, bits)
+        if frac >= units and frac + units < 1 << bits and \
+                (frac - units) >> guard == (frac + units) >> guard:
+            break
+        guard *= 2
+    value = frac >> guard
+    return [(value >> (digit_bits * (count - 1 - pos))) &
+            ((1 << digit_bits) - 1) for pos in range(count)]
+
+
+# Chudnovsky series, with the term ratio as p(k)/q(k) where
+# q(k) = k^3 640320^3 / 24
+def _chudnovsky_p(k):
+    return -(6*k - 5) * (2*k - 1) * (6*k - 1) if k > 0 else 1
+
+
+def _chudnovsky_q(k):
+    return k**3 * 10939058860032000 if k > 0 else 1
+
+
+def _chudnovsky_a(k):
+    return 13591409 + 545140134*k
+
+
+class LeibnizTerm(object):
+    '''kth term of the Leibniz series for pi, (-1)^k 4/(2k+1)'''
+    def __init__(self, sifr_system):
+        self.ssys = sifr_system
+        self.two = sifr_system.from_int(2)
+        self.four = sifr_system.from_int(4)
 
-        logging.debug("  NOTE THAT 13/8 WILL BE ADDED TO RUNNING RESULT")
+    def __call__(self, k):
+        term = self.four / (self.two * k + self.ssys.one)
+        if k % self.two == self.ssys.zero:
+            return term
+        return -term
 
-        series_result = Xuarizm(phi_algo,
-                                s,
-                                upper_bound=upper_bound).arith_series()
 
-        # return thirteen / eight + series_result
-        return thirteen / eight + series_result
+class Constants(object):
+    '''Each constant is worked out in the same numbering system to
+    guard_digits more xcimal places (at least one, as it is truncated
+    there) and rounded once to the precision of the system at the end from
+    the digit after it. Where the upper bound is left out, the number of
+    terms is found from that precision and the constant is cached (in the
+    shared constant_cache unless another ConstantCache, or None, is given).
+    Series are summed over parallel worker processes if it is set'''
+    def __init__(self, sifr_system, guard_digits=4, cache=constant_cache,
+                 parallel=None):
+        self.ssys = sifr_system
+        self.guard_digits = guard_digits
+        self.cache = cache
+        self.parallel = parallel
+        self.wsys = sifr_system.with_xcimal_places(
+            sifr_system.xcimal_places + max(guard_digits, 1))
+
+    def _bound(self, upper_bound):
+        if upper_bound is None:
+            return None
+        return self.wsys.convert(upper_bound)
+
+    def _truncated(self, value):
+        '''Value worked out to more places truncated into the working
+        system'''
+        mant, exp = value.ssys._num_truncate(value._mant, value._exp,
+                                             self.wsys.xcimal_places)
+        return Sifr._from_num(value.is_neg, mant, exp, self.wsys)
 
-    def return_e(self, upper_bound):
-        s = self.ssys
+    def return_leibniz_pi(self, upper_bound):
+        pi = Xuarizm(LeibnizTerm(self.wsys), self.wsys,
+                     upper_bound=self._bound(upper_bound)
+                     ).arith_series(self.parallel)
+        return self.ssys.convert(pi)
+
+    @cached_constant('bbp_pi')
+    def return_bbp_pi(self, upper_bound=None):
+        s = self.wsys
+
+        return Xuarizm(None, s, upper_bound=self._bound(upper_bound)
+                       ).binary_split_series(_unit, _bbp_q, _bbp_a, _bbp_b,
+                                             self.parallel, truncate=True)
+
+    def return_pi_digits(self, start, count=1):
+        '''The count digits of pi from the xcimal place start on (1 being
+        the first place after the xcimal point) as a string, extracted by
+        the BBP formula without working out the places before them. Only
+        for systems whose base is a power of two (such as hexadecimal or
+        binary). Given parallel, the digits are split into that many runs
+        worked out in worker processes'''
+        base = self.ssys.base_no
+        if base & (base - 1):
+            raise SifrScopeException("Digit extraction is only implemented " +
+                                     "for bases that are powers of two")
+        if isinstance(start, Sifr):
+            start = _whole_number(start)
+        if isinstance(count, Sifr):
+            count = _whole_number(count)
+        if start < 1 or count < 0:
+            raise SifrScopeException("Digits start from xcimal place 1")
+        digit_bits = base.bit_length() - 1
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG,
+                             "Extracting " + str(count) + " digits of pi " +
+                             "from xcimal place " + str(start))
+
+        if not self.parallel or count < 2:
+            digits = _bbp_pi_digits((start - 1) * digit_bits, count,
+                                    digit_bits) if count else []
+        else:
+            runs = [(start + run * count // self.parallel,
+                     (run + 1) * count // self.parallel -
+                     run * count // self.parallel)
+                    for run in range(self.parallel)]
+            runs = [(first, run_count) for first, run_count in runs
+                    if run_count]
+            with concurrent.futures.ProcessPoolExecutor(self.parallel) \
+                    as executor:
+                digits = sum(executor.map(
+                    _bbp_pi_digits,
+                    [(first - 1) * digit_bits for first, _ in runs],
+                    [run_count for _, run_count in runs],
+                    [digit_bits] * len(runs)), [])
+        return ''.join(self.ssys.digit_list[digit] for digit in digits)
+
+    def return_pi_digit(self, n):
+        '''The digit of pi at xcimal place n (see return_pi_digits)'''
+        return self.return_pi_digits(n, 1)
+
+    def return_pi(self, upper_bound=None):
+        '''Pi by whichever method is quickest to the precision of the
+        system. Timed from 5 to 60000 decimal places and in bases 2 and 16,
+        the Chudnovsky series came out ahead throughout (from level with BBP
+        at a few places to ten times quicker at thousands, with the
+        Gauss-Legendre iteration in between), so it is always picked'''
+        return self.return_chudnovsky_pi(upper_bound)
+
+    @cached_constant('chudnovsky_pi')
+    def return_chudnovsky_pi(self, upper_bound=None):
+        '''Pi from the Chudnovsky series (about 14 decimal digits a term),
+        summed by binary splitting, as 426880 sqrt(10005) / series (with
+        the series as its exact ratio and the root truncated, so the one
+        division truncates pi to the working precision)'''
+        s = self.wsys
+        numer, denom = Xuarizm(None, s, upper_bound=self._bound(upper_bound)
+                               )._split_ratio(_chudnovsky_p, _chudnovsky_q,
+                                              _chudnovsky_a,
+                                              parallel=self.parallel)
+        scale = s.base_no**s.xcimal_places
+        root = s._int_sqrt(10005 * scale * scale)
+        mant, _ = s._int_divmod(426880 * root * denom, numer)
+        return Sifr._from_num(False, mant, s.xcimal_places, s)
+
+    @cached_constant('agm_pi')
+    def return_agm_pi(self, upper_bound=None):
+        '''Pi by the Gauss-Legendre (arithmetic-geometric mean) iteration,
+        which doubles the correct digits with each step, for upper_bound
+        steps or until the means agree to the precision of the system'''
+        # Each step adds a few units of rounding error, so the steps are
+        # worked to more places again (enough for 16 units a step)
+        places = self.wsys.xcimal_places
+        s = self.wsys.with_xcimal_places(places + math.ceil(
+            math.log(16 * places.bit_length(), self.ssys.base_no)))
+        two = s.from_int(2)
+        steps = None if upper_bound is None else int(upper_bound)
+        # The means are only equal to within the rounding of the system
+        # they are worked in, so they are taken to agree within a unit of
+        # the last xcimal place of the working system
+        tolerance = Sifr._from_num(False, 1, self.wsys.xcimal_places, s)
+
+        a, b = s.one, s.one / two.sqrt()
+        t, power = s.one / s.from_int(4), s.one
+        step = 0
+        while abs(a - b) > tolerance and (steps is None or step < steps):
+            a, b, prev_a = (a + b) / two, (a * b).sqrt(), a
+            t -= power * (prev_a - a) * (prev_a - a)
+            power *= two
+            step += 1
+            if s.trace:
+                s._trace(logging.DEBUG, "  AGM step " + str(step))
+        return self._truncated((a + b) * (a + b) / (s.from_int(4) * t))
+
+    @cached_constant('fibonacci_phi')
+    def return_fibonacci_phi(self, upper_bound=None):
+        '''Phi as the ratio of the Fibonacci numbers F(n+2)/F(n+1), with n
+        the upper bound'''
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG,
+                             "Calculating Phi using Fibonacci sequence")
+
+        s = self.wsys
+        if upper_bound is None:
+            # The ratio of consecutive Fibonacci numbers is out from phi by
+            # about phi^-2n, which is taken to the guard digits past the
+            # working precision as the ratio is truncated there
+            n = math.ceil((s.xcimal_places + self.guard_digits) *
+                          math.log(s.base_no) /
+                          (2 * math.log((1 + math.sqrt(5)) / 2))) + 1
+        else:
+            n = max(int(upper_bound), 0)
+
+        # Through Formulae so the Fibonacci numbers come from the memo of
+        # the system when it is switched on
+        fib_old = _whole_number(Formulae.fibonacci(s.from_int(n + 1)))
+        fib_new = _whole_number(Formulae.fibonacci(s.from_int(n + 2)))
+        mant, exp = s._num_truncated_ratio(fib_new, fib_old)
+        phi = Sifr._from_num(False, mant, exp, s)
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG, "Phi Estimate: " + phi.sifr)
 
-        def e_algo(k):
-            return Sifr(s.unit, s) / Formulae.factorial(k)
+        return phi
 
-        return Xuarizm(e_algo, s, upper_bound=upper_bound).arith_series()
+    @cached_constant('phi')
+    def return_phi(self, upper_bound=None):
+        '''Phi as (1 + sqrt(5))/2, with the square root worked out by
+        Newton iteration to the working precision (so no upper bound is
+        needed and any given is not used)'''
+        s = self.wsys
+        scale = s.base_no**s.xcimal_places
+        root_five = s._int_sqrt(5 * scale * scale)
+        return Sifr._from_num(False, (scale + root_five) // 2,
+                              s.xcimal_places, s)
+
+    @cached_constant('arith_phi')
+    def return_arith_phi(self, upper_bound=None):
+        '''Phi as 13/8 plus the series of (-1)^(k+1) (2k+1)! /
+        ((k+2)! k! 4^(2k+3)). Each term is rounded twice (in its
+        multiplication and division) so the terms are worked to as many
+        more places as the count of them takes digits, keeping their
+        rounding errors past the working precision'''
+        places = self.wsys.xcimal_places
+        if upper_bound is None:
+            # The terms fall by about a quarter each
+            terms = places * math.log(self.ssys.base_no) / math.log(4) + 1
+        else:
+            terms = max(int(upper_bound) + 1, 1)
+        s = self.wsys.with_xcimal_places(
+            places + math.ceil(math.log(terms, self.ssys.base_no)) + 1)
+
+        one = s.one
+        two = s.from_int(2)
+        eight = s.from_int(8)
+        thirteen = s.from_int(13)
+
+        # (-1)^(k+1) (2k+1)! / ((k+2)! k! 4^(2k+3)), each term being the
+        # one before times -(2k+1)/(8(k+2))
+        def phi_next(prev, k):
+            return prev * -(two * k + one) / (eight * (k + two))
+
+        if s.trace:
+            s._trace(logging.DEBUG,
+                     "  NOTE THAT 13/8 WILL BE ADDED TO RUNNING RESULT")
+
+        first_term = -one / s.from_int(128)
+        bound = None if upper_bound is None else s.convert(upper_bound)
+        series_result = Xuarizm(None, s, upper_bound=bound
+                                ).recurrence_series(first_term, phi_next)
+
+        return self._truncated(thirteen / eight + series_result)
+
+    @cached_constant('e')
+    def return_e(self, upper_bound=None):
+        return Xuarizm(None, self.wsys, upper_bound=self._bound(upper_bound)
+                       ).binary_split_series(_unit, _e_q,
+                                             parallel=self.parallel,
+                                             truncate=True)
 
 
 class Xuarizm(object):
+    '''Sums series from the lower bound to the upper bound. Without an
+    upper bound, summing stops at the first term that is zero to the
+    precision of the system, or for binary splitting once the terms fall
+    guard_digits xcimal places past it'''
     def __init__(self, algo, sifr_system: SifrSystem,
-                 lower_bound=None, upper_bound=None, step=None):
+                 lower_bound=None, upper_bound=None, step=None,
+                 guard_digits=4):
         self.lbnd = (lower_bound if lower_bound is not None
-                     else Sifr(sifr_system.iden, sifr_system))
+                     else sifr_system.zero)
         self.ubnd = upper_bound
+        self.guard_digits = guard_digits
         self.ssys = sifr_system
-        self.step = step if step is not None else Sifr(sifr_system.unit,
-                                                       sifr_system)
+        self.step = step if step is not None else sifr_system.one
 
         @mask_logging
         def masked_algo(x):
@@ -178,6 +582,7 @@ class Xuarizm(object):
         def masked_eq(x, y):
             return x == y
 
+        self._algo = algo
         self.algo = masked_algo
         self.m_add = masked_add
         self.m_prod = masked_prod
@@ -185,30 +590,217 @@ class Xuarizm(object):
         self.m_eq = masked_eq
         self.ssys = sifr_system
 
-    def arith_series(self):
-        term = self.lbnd
-        series_result = Sifr(self.ssys.iden, self.ssys)
-        logging.debug("XUARIZM: Starting term: " + series_result.sifr)
-        added_term_is_zero = False
-        while self.m_le(term, self.ubnd) and not added_term_is_zero:
-            added_value = self.algo(term)
-            logging.debug("    XUARIZM: Increment : " + added_value.sifr)
+    def arith_series(self, parallel=None):
+        '''Sums algo(k) over the bounds. Given a number of processes as
+        parallel, the bounds are split into that many runs of terms that are
+        summed in worker processes (so algo has to be picklable, e.g. a top
+        level function) and the sums of the runs are added up pairwise. As
+        every run stops at its own first zero term, any terms after a zero
+        term are taken to be zero as well'''
+        if not parallel:
+            return self.term_series(self.algo(k) for k in self._indices())
+        if self.ubnd is None:
+            raise SifrScopeException("Parallel series need an upper bound")
+
+        count = int((self.ubnd - self.lbnd) // self.step) + 1
+        runs = []
+        for run in range(parallel):
+            start = run * count // parallel
+            end = (run + 1) * count // parallel
+            if end > start:
+                runs.append((self.lbnd + self.step * self.ssys.from_int(start),
+                             self.lbnd + self.step *
+                             self.ssys.from_int(end - 1)))
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG,
+                             "XUARIZM: Summing " + str(count) + " terms in " +
+                             str(len(runs)) + " processes")
+
+        with concurrent.futures.ProcessPoolExecutor(parallel) as executor:
+            sums = list(executor.map(_sum_run,
+                                     [self._algo] * len(runs),
+                                     [self.ssys] * len(runs),
+                                     [first for first, _ in runs],
+                                     [last for _, last in runs],
+                                     [self.step] * len(runs)))
+        if not sums:
+            return self.ssys.zero
+        sums = [Sifr._from_num(run_sum.is_neg, run_sum._mant, run_sum._exp,
+                               self.ssys) for run_sum in sums]
+        return _pairwise(sums, self.m_add)
+
+    def recurrence_series(self, first_term, next_term):
+        '''Sums the series whose first term (at the lower bound) is given
+        and where every other term comes from the one before it as
+        next_term(previous term, k), so running products such as factorials
+        and powers are carried from term to term rather than recomputed'''
+        masked_next = mask_logging(next_term)
+
+        def terms():
+            term = first_term
+            for pos, k in enumerate(self._indices()):
+                if pos > 0:
+                    term = masked_next(term, k)
+                yield term
+        return self.term_series(terms())
+
+    def _indices(self):
+        k = self.lbnd
+        while self.ubnd is None or self.m_le(k, self.ubnd):
+            yield k
+            k = self.m_add(k, self.step)
+
+    def term_series(self, terms):
+        '''Sums the terms of an iterable (e.g. a generator keeping its own
+        state between terms) until it is exhausted or a term is zero'''
+        series_result = self.ssys.zero
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG,
+                             "XUARIZM: Starting term: " + series_result.sifr)
+        for added_value in terms:
+            if self.ssys.trace:
+                self.ssys._trace(logging.DEBUG,
+                                 "    XUARIZM: Increment : " +
+                                 added_value.sifr)
             series_result = self.m_add(series_result, added_value)
-            logging.debug("  XUARIZM: Running term: " + series_result.sifr)
-            added_term_is_zero = self.m_eq(added_value,
-                                           Sifr(self.ssys.iden, self.ssys))
-            term = self.m_add(term, self.step)
+            if self.ssys.trace:
+                self.ssys._trace(logging.DEBUG,
+                                 "  XUARIZM: Running term: " +
+                                 series_result.sifr)
+            if self.m_eq(added_value, self.ssys.zero):
+                break
 
         return series_result
 
     def rational_series(self):
+        if self.ubnd is None:
+            raise SifrScopeException("Rational series need an upper bound")
         term = self.lbnd
-        result = Sifr(self.ssys.iden, self.ssys)
+        result = self.ssys.zero
 
-        logging.debug("XUARIZM: Starting term: " + result.sifr)
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG,
+                             "XUARIZM: Starting term: " + result.sifr)
         while self.m_le(term, self.ubnd):
             result = self.m_prod(result, self.algo(term))
-            logging.debug("  XUARIZM: Running term: " + result.sifr)
+            if self.ssys.trace:
+                self.ssys._trace(logging.DEBUG,
+                                 "  XUARIZM: Running term: " + result.sifr)
             term = self.m_add(term, self.step)
 
         return result
+
+    @staticmethod
+    def _split(n1, n2, p, q, a, b):
+        '''Binary splitting of the terms n1 to n2 (exclusive) into the
+        integers P, Q, B and T where the partial sum is T/(B*Q)'''
+        if n2 - n1 == 1:
+            p_n = p(n1)
+            return p_n, q(n1), b(n1), a(n1) * p_n
+        mid = (n1 + n2) // 2
+        return Xuarizm._join(Xuarizm._split(n1, mid, p, q, a, b),
+                             Xuarizm._split(mid, n2, p, q, a, b))
+
+    @staticmethod
+    def _join(left, right):
+        '''P, Q, B and T of two neighbouring runs of terms joined'''
+        p_l, q_l, b_l, t_l = left
+        p_r, q_r, b_r, t_r = right
+        return (p_l * p_r, q_l * q_r, b_l * b_r,
+                b_r * q_r * t_l + b_l * p_l * t_r)
+
+    def _split_end(self, n1, p, q, a, b):
+        '''First term past n1 for which the terms have fallen (and keep
+        falling) below guard_digits xcimal places past the precision, found
+        from the logarithms of the term ratios'''
+        def log_abs(n):
+            return math.log(abs(n)) if n != 0 else -math.inf
+
+        limit = -(self.ssys.xcimal_places + self.guard_digits) * \
+            math.log(self.ssys.base_no)
+        log_prod = 0.0
+        k = n1
+        while True:
+            p_k = p(k)
+            if p_k == 0:
+                return k + 1
+            log_prod += log_abs(p_k) - log_abs(q(k))
+            log_term = log_prod + log_abs(a(k)) - log_abs(b(k))
+            falling = log_abs(p(k + 1)) < log_abs(q(k + 1))
+            if log_term < limit and log_prod < limit and falling:
+                return k + 1
+            k += 1
+
+    def binary_split_series(self, p, q, a=None, b=None, parallel=None,
+                            truncate=False):
+        '''Sums the series with terms a(k)/b(k) * p(0)...p(k)/q(0)...q(k)
+        over the (integer) bounds, where p, q, a and b take and return
+        Python integers (a and b default to one). The sum is held as exact
+        integers until the one division, rounded to the system precision
+        (or truncated to it if truncate is set, for a working value that is
+        rounded again). Given a number of processes as parallel, the terms
+        are split into that many runs, each split in a worker process (so
+        p, q, a and b have to be picklable), and the runs are joined
+        pairwise'''
+        numer, denom = self._split_ratio(p, q, a, b, parallel)
+        if numer == 0:
+            return self.ssys.zero
+        if truncate:
+            mant, exp = self.ssys._num_truncated_ratio(abs(numer), denom)
+            return Sifr._from_num(numer < 0, mant, exp, self.ssys)
+        return Sifr._from_ratio(numer, denom, self.ssys)
+
+    def _split_ratio(self, p, q, a=None, b=None, parallel=None):
+        '''The sum of binary_split_series as the exact ratio T/(B*Q)
+        Returns: [numerator, (positive) denominator]'''
+        if self.step != self.ssys.one:
+            raise SifrScopeException("Binary splitting only implemented " +
+                                     "for a step of one")
+        a = a if a is not None else _unit
+        b = b if b is not None else _unit
+        n1 = int(self.lbnd)
+        if self.ubnd is not None:
+            n2 = int(self.ubnd) + 1
+        else:
+            n2 = self._split_end(n1, p, q, a, b)
+        if self.ssys.trace:
+            self.ssys._trace(logging.DEBUG,
+                             "XUARIZM: Binary splitting " + str(n2 - n1) +
+                             " terms")
+        if n2 <= n1:
+            return 0, 1
+
+        if parallel and n2 - n1 > parallel:
+            bounds = [n1 + run * (n2 - n1) // parallel
+                      for run in range(parallel + 1)]
+            with concurrent.futures.ProcessPoolExecutor(parallel) as executor:
+                runs = list(executor.map(Xuarizm._split,
+                                         bounds[:-1], bounds[1:],
+                                         [p] * parallel, [q] * parallel,
+                                         [a] * parallel, [b] * parallel))
+            _, q_all, b_all, t_all = _pairwise(runs, Xuarizm._join)
+        else:
+            _, q_all, b_all, t_all = self._split(n1, n2, p, q, a, b)
+        denom = b_all * q_all
+        if denom < 0:
+            t_all, denom = -t_all, -denom
+        return t_all, denom
+
+
+# Parallel helpers (top level so worker processes can be sent them)
+def _sum_run(algo, sifr_system, first, last, step):
+    '''Sum of a run of terms of an arithmetic series'''
+    return Xuarizm(algo, sifr_system, lower_bound=first, upper_bound=last,
+                   step=step).arith_series()
+
+
+def _pairwise(items, join):
+    '''Joins neighbouring items in pairs, and those in pairs and so on,
+    down to the one (a tree reduction keeping the order of the items)'''
+    while len(items) > 1:
+        joined = [join(items[k], items[k + 1])
+                  for k in range(0, len(items) - 1, 2)]
+        if len(items) % 2:
+            joined.append(items[-1])
+        items = joined
+    return items[0]
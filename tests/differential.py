@@ -0,0 +1,312 @@
+# #############################################################################
+# Differential test script to run through terminal:
+#     python tests/differential.py --cases 2000 --seed 1
+# Generates random SifrSystems (random alphabets, radix and negative symbols,
+# bases and precisions) and random operands in them, then runs each operation
+# through the string algorithms (_base_add_alg, _base_subt_alg, _base_mul,
+# _base_div, round_half_to_inf), the numeric engine (_num_* on integer
+# mantissas) and the Sifr operators, checking every result against Python
+# int/Fraction arithmetic worked out independently of the SifrSystem. Prints
+# any mismatch with the system and operands that gave it, and the throughput
+# of each engine on each operation.
+# #############################################################################
+
+import argparse
+import random
+import sys
+import time
+from fractions import Fraction
+
+from sifr.systems import SifrSystem, SifrScopeException
+from sifr.sifr import Sifr
+
+# Unicode ranges the alphabets are drawn from (ASCII, Greek, Cyrillic,
+# Hebrew, CJK)
+CHAR_RANGES = ((0x21, 0x7E), (0x391, 0x3C9), (0x410, 0x44F), (0x5D0, 0x5EA),
+               (0x4E00, 0x9FFF))
+
+
+# GENERATORS
+def random_system(rand, max_base, max_places):
+    '''SifrSystem of a random base with digits, radix and negative symbol
+    drawn (all distinct) from the character ranges'''
+    base = rand.choice([2, 3, 10, 16, rand.randint(2, max_base)])
+    base = min(base, max(last - first for first, last in CHAR_RANGES) - 1)
+    first, last = rand.choice(CHAR_RANGES)
+    while last - first + 1 < base + 2:
+        first, last = rand.choice(CHAR_RANGES)
+    chars = [chr(code) for code in rand.sample(range(first, last + 1),
+                                               base + 2)]
+    return SifrSystem(''.join(chars[:base]), radix=chars[base],
+                      neg_sym=chars[base + 1],
+                      xcimal_places=rand.randint(0, max_places))
+
+
+def random_digits(ssys, rand, length):
+    return ''.join(rand.choice(ssys.digit_list) for _ in range(length))
+
+
+def random_magnitude(ssys, rand, max_digits):
+    '''Normalised sifr string of a random non-negative number (zero, a whole
+    number or one with xcimals, of up to max_digits digits each side)'''
+    whole = random_digits(ssys, rand, rand.randint(0, max_digits))
+    xcimal = random_digits(ssys, rand, rand.choice(
+        [0, rand.randint(0, max_digits), ssys.xcimal_places]))
+    return ssys._norm_ans(whole + ssys.radix + xcimal)
+
+
+# GROUND TRUTH (from the digit list alone)
+def digits_value(ssys, d):
+    '''Integer of a sequence of digits'''
+    result = 0
+    for digit in d:
+        result = result * ssys.base_no + ssys.digit_list.index(digit)
+    return result
+
+
+def value(ssys, d):
+    '''Fraction of a sifr string'''
+    is_neg = d.startswith(ssys.neg_sym)
+    d = d[len(ssys.neg_sym):] if is_neg else d
+    whole, _, xcimal = d.partition(ssys.radix)
+    result = Fraction(digits_value(ssys, whole + xcimal),
+                      ssys.base_no**len(xcimal))
+    return -result if is_neg else result
+
+
+def rounded(ssys, x, places):
+    '''x rounded to places xcimal places by the digit after them (rounding
+    the magnitude up when that digit is at least half the base)'''
+    base = ssys.base_no
+    magnitude = abs(x)
+    scaled = magnitude.numerator * base**(places + 1) // magnitude.denominator
+    result = Fraction(scaled // base + (2 * (scaled % base) >= base),
+                      base**places)
+    return -result if x < 0 else result
+
+
+def num_value(ssys, is_neg, mant, exp):
+    result = Fraction(mant, ssys.base_no**exp)
+    return -result if is_neg else result
+
+
+# OPERATIONS
+# Each gives the exact (or correctly rounded) Fraction and, by engine, the
+# functions of the operands giving a Fraction to compare with it
+def signed(is_neg, magnitude):
+    return -magnitude if is_neg else magnitude
+
+
+def add_case(ssys, d1, d2):
+    x, y = value(ssys, d1), value(ssys, d2)
+    n1, n2 = ssys._to_num(d1), ssys._to_num(d2)
+
+    def string():
+        result, _ = ssys._dec_combine(d1, d2, ssys._base_add_alg)
+        return value(ssys, ssys._norm_ans(result))
+
+    def numeric():
+        m1, m2, exp = ssys._num_align(n1[1], n1[2], n2[1], n2[2])
+        return num_value(ssys, False, m1 + m2, exp)
+    return x + y, {'string': string, 'numeric': numeric}
+
+
+def sub_case(ssys, d1, d2):
+    x, y = value(ssys, d1), value(ssys, d2)
+    n1, n2 = ssys._to_num(d1), ssys._to_num(d2)
+
+    def string():
+        result, zero_cross = ssys._dec_combine(d1, d2, ssys._base_subt_alg)
+        return signed(zero_cross, value(ssys, ssys._norm_ans(result)))
+
+    def numeric():
+        m1, m2, exp = ssys._num_align(n1[1], n1[2], n2[1], n2[2])
+        return num_value(ssys, m1 < m2, abs(m1 - m2), exp)
+    return x - y, {'string': string, 'numeric': numeric}
+
+
+def mul_case(ssys, d1, d2):
+    x, y = value(ssys, d1), value(ssys, d2)
+    n1, n2 = ssys._to_num(d1), ssys._to_num(d2)
+
+    def numeric():
+        mant, exp = ssys._num_mul(n1[1], n1[2], n2[1], n2[2])
+        return num_value(ssys, False, mant, exp)
+    return rounded(ssys, x * y, ssys.xcimal_places), {
+        'string': lambda: value(ssys, ssys._base_mul(d1, d2)),
+        'numeric': numeric}
+
+
+def div_case(ssys, d1, d2):
+    x, y = value(ssys, d1), value(ssys, d2)
+    if y == 0:
+        return None, {}
+    n1, n2 = ssys._to_num(d1), ssys._to_num(d2)
+
+    def numeric():
+        mant, exp = ssys._num_div(n1[1], n1[2], n2[1], n2[2])
+        return num_value(ssys, False, mant, exp)
+    return rounded(ssys, x / y, ssys.xcimal_places), {
+        'string': lambda: value(ssys, ssys._base_div(d1, d2)),
+        'numeric': numeric}
+
+
+def round_case(ssys, d1, d2):
+    x = value(ssys, d1)
+    level = len(d2) % (ssys.xcimal_places + 2)
+    n1 = ssys._to_num(d1)
+
+    def numeric():
+        mant, exp = ssys._num_round(n1[1], n1[2], level)
+        return num_value(ssys, False, mant, exp)
+    return rounded(ssys, x, level), {
+        'string': lambda: value(ssys, ssys.round_half_to_inf(d1, level)),
+        'numeric': numeric}
+
+
+def digit_case(ssys, d1, d2):
+    '''Digit sequences through the limb algorithms against int'''
+    a, b = digits_value(ssys, d1), digits_value(ssys, d2)
+    width = max(len(d1), len(d2))
+
+    def add():
+        result, carry = ssys._base_add_alg(d1, d2)
+        return digits_value(ssys, result), carry
+    engines = {'add': add,
+               'mul': lambda: digits_value(ssys, ssys._digit_mul(d1, d2))}
+    truth = {'add': ((a + b) % ssys.base_no**width,
+                     a + b >= ssys.base_no**width),
+             'mul': a * b}
+    if b:
+        engines['divmod'] = lambda: tuple(
+            digits_value(ssys, part) for part in ssys._digit_divmod(d1, d2))
+        truth['divmod'] = divmod(a, b)
+    return truth, engines
+
+
+def sifr_case(ssys, d1, d2, op, rand):
+    '''The Sifr operators (signed, on the numeric engine, and through the
+    string each result renders to)'''
+    if rand.random() < 0.5:
+        d1 = ssys.neg_sym + d1 if value(ssys, d1) else d1
+    if rand.random() < 0.5:
+        d2 = ssys.neg_sym + d2 if value(ssys, d2) else d2
+    x, y = value(ssys, d1), value(ssys, d2)
+    s1, s2 = Sifr(d1, ssys), Sifr(d2, ssys)
+    places = ssys.xcimal_places
+    if op == 'add':
+        return x + y, lambda: value(ssys, (s1 + s2).sifr)
+    if op == 'sub':
+        return x - y, lambda: value(ssys, (s1 - s2).sifr)
+    if op == 'mul':
+        return rounded(ssys, x * y, places), \
+            lambda: value(ssys, (s1 * s2).sifr)
+    if op == 'div':
+        if y == 0:
+            return None, None
+        return rounded(ssys, x / y, places), \
+            lambda: value(ssys, (s1 / s2).sifr)
+    level = len(d2) % (places + 2)
+    return rounded(ssys, x, level), \
+        lambda: value(ssys, s1.round(level).sifr)
+
+
+CASES = {'add': add_case,
+         'sub': sub_case,
+         'mul': mul_case,
+         'div': div_case,
+         'round': round_case}
+
+
+# RUNNER
+class Tally(object):
+    '''Calls, failures and time taken by each (operation, engine)'''
+    def __init__(self):
+        self.calls = {}
+        self.seconds = {}
+        self.failures = []
+
+    def check(self, key, truth, func, context):
+        start = time.perf_counter()
+        try:
+            result = func()
+        except SifrScopeException as exc:
+            result = 'raised ' + repr(exc)
+        self.seconds[key] = self.seconds.get(key, 0) + \
+            time.perf_counter() - start
+        self.calls[key] = self.calls.get(key, 0) + 1
+        if result != truth:
+            self.failures.append((key, truth, result, context))
+
+    def report(self):
+        print('{:<10} {:<8} {:>8} {:>12}'.format('operation', 'engine',
+                                                 'calls', 'ops/s'))
+        for key in sorted(self.calls):
+            print('{:<10} {:<8} {:>8} {:>12.0f}'.format(
+                key[0], key[1], self.calls[key],
+                self.calls[key] / max(self.seconds[key], 1e-9)))
+
+
+def describe(ssys):
+    return ('base ' + str(ssys.base_no) + ', digits ' +
+            repr(ssys.digit_list[:12] + ('...' if ssys.base_no > 12
+                                         else '')) +
+            ', radix ' + repr(ssys.radix) + ', neg ' + repr(ssys.neg_sym) +
+            ', xcimal places ' + str(ssys.xcimal_places))
+
+
+def run(cases, seed, max_base, max_places, max_digits, tally):
+    rand = random.Random(seed)
+    for _ in range(cases):
+        ssys = random_system(rand, max_base, max_places)
+        d1 = random_magnitude(ssys, rand, max_digits)
+        d2 = random_magnitude(ssys, rand, max_digits)
+        context = describe(ssys) + ': ' + repr(d1) + ', ' + repr(d2)
+
+        for op, case in CASES.items():
+            truth, engines = case(ssys, d1, d2)
+            for engine, func in engines.items():
+                tally.check((op, engine), truth, func, context)
+            truth, func = sifr_case(ssys, d1, d2, op, rand)
+            if func is not None:
+                tally.check((op, 'sifr'), truth, func, context)
+
+        seq1 = random_digits(ssys, rand, rand.randint(1, 4 * max_digits))
+        seq2 = random_digits(ssys, rand, rand.randint(1, 4 * max_digits))
+        truths, engines = digit_case(ssys, seq1, seq2)
+        for op, func in engines.items():
+            tally.check(('digits ' + op, 'limbs'), truths[op], func,
+                        describe(ssys) + ': ' + repr(seq1) + ', ' +
+                        repr(seq2))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Differential test of the Sifr engines against ' +
+        'int/Fraction')
+    parser.add_argument('--cases', type=int, default=1000,
+                        help='random systems and operand pairs to try')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-base', type=int, default=300)
+    parser.add_argument('--max-places', type=int, default=30,
+                        help='most xcimal places of a system')
+    parser.add_argument('--max-digits', type=int, default=40,
+                        help='most digits each side of the radix')
+    args = parser.parse_args(argv)
+
+    tally = Tally()
+    run(args.cases, args.seed, args.max_base, args.max_places,
+        args.max_digits, tally)
+    tally.report()
+
+    print('')
+    for key, truth, result, context in tally.failures[:20]:
+        print('MISMATCH ' + ' '.join(key) + ' ' + context)
+        print('    expected ' + str(truth) + ', got ' + str(result))
+    print(str(len(tally.failures)) + ' mismatches in ' +
+          str(sum(tally.calls.values())) + ' checks')
+    return 1 if tally.failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
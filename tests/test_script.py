@@ -5,16 +5,28 @@
 # standard python
 # #############################################################################
 
+import functools
 import logging
+import math
 import multiprocessing
+import os
+import shutil
+import tempfile
 import time
 
 from systems import SifrSystem
 from systems import SifrScopeException
+from systems import mask_logging
 from sifr import Sifr
 from decimal import Decimal, getcontext
+from fractions import Fraction
 
-from xuarizm import Constants
+from xuarizm import Constants, Formulae, LeibnizTerm, Xuarizm
+import sifr.arrays as sifr_arrays
+from sifr.cache import ConstantCache
+from sifr.profiling import PRIMITIVES
+from sifr import functions
+from sifr import SifrArray
 
 # DEBUG, INFO, WARNING, ERROR, CRITICAL are the values for logging values
 log_level = logging.WARNING
@@ -330,6 +342,36 @@ if xuarizm_test:
         print("    " + pi_ans)
     print("")
 
+    for method in (c.return_chudnovsky_pi, c.return_agm_pi):
+        method_calc = str(method())[:92]
+        print("# ########")
+        print("# Pi TEST (" + method.__name__ + ")")
+        print(" Calculated pi:")
+        print("    " + method_calc)
+        if method_calc == pi_ans:
+            print("        PASS")
+        else:
+            print("        FAIL")
+            print(" Correct value:")
+            print("    " + pi_ans)
+        print("")
+
+    hex_c = Constants(SifrSystem('0123456789ABCDEF', xcimal_places=10))
+    hex_calc = hex_c.return_pi_digits(1, 20) + ' ' + \
+        hex_c.return_pi_digit(1000)
+    hex_ans = '243F6A8885A308D31319 3'
+    print("# ########")
+    print("# Pi DIGIT EXTRACTION TEST (hexadecimal places 1-20 and 1000)")
+    print(" Calculated digits:")
+    print("    " + hex_calc)
+    if hex_calc == hex_ans:
+        print("        PASS")
+    else:
+        print("        FAIL")
+        print(" Correct value:")
+        print("    " + hex_ans)
+    print("")
+
     print("# ########")
     print("# Phi TEST")
     print(" Calculated phi:")
@@ -356,3 +398,472 @@ if xuarizm_test:
 
 else:
     print("Xuarizm test not run")
+
+# #############################################################################
+# Tests of known values of the other features (conversion, interop, roots,
+# formulae, functions, arrays, caches, parallel series and profiling)
+
+print("FEATURE TESTS: Testing against known values")
+
+
+def known_tester(name, calc, ans):
+    '''Prints PASS if the calculated value is the known answer'''
+    print("# ########")
+    print("# " + name + " TEST")
+    print(" Calculated:")
+    print("    " + str(calc))
+    if calc == ans:
+        print("        PASS")
+    else:
+        print("        FAIL")
+        print(" Correct value:")
+        print("    " + str(ans))
+    print("")
+
+
+def raises_tester(name, func, *args):
+    '''Prints PASS if func(*args) raises a SifrScopeException (matched by
+    name, as this script imports the modules both directly and through the
+    package)'''
+    print("# ########")
+    print("# " + name + " TEST")
+    try:
+        result = func(*args)
+        print("        FAIL")
+        print(" Expected a SifrScopeException, got: " + str(result))
+    except Exception as exc:
+        if type(exc).__name__ == 'SifrScopeException':
+            print(" Raised: " + str(exc))
+            print("        PASS")
+        else:
+            print("        FAIL")
+            print(" Expected a SifrScopeException, got: " + repr(exc))
+    print("")
+
+
+# Conversion between systems
+binary_sys = SifrSystem('01', xcimal_places=160)
+hex_sys = SifrSystem('0123456789ABCDEF', xcimal_places=40)
+known_tester("CONVERSION (decimal to binary)",
+             Sifr('10.5', s).to_system(binary_sys).sifr, '1010.1')
+known_tester("CONVERSION (decimal to hexadecimal)",
+             Sifr('-255.75', s).to_system(hex_sys).sifr, '-FF.C')
+for num in number_link.values():
+    known_tester("CONVERSION ROUND TRIP (" + num.sifr + " through binary)",
+                 num.to_system(binary_sys).to_system(s), num)
+    known_tester("CONVERSION ROUND TRIP (" + num.sifr + " through hex)",
+                 hex_sys.convert(num).to_system(s), num)
+known_tester("CONVERSION (rounding to the places of the target)",
+             Sifr('0.1', s).to_system(SifrSystem('01', xcimal_places=4)).sifr,
+             '0.001')
+
+# Interop with Python's number types
+known_tester("FROM INT",
+             Sifr.from_int(-12345678901234567890, s),
+             Sifr('-12345678901234567890', s))
+known_tester("FROM FRACTION (exact)",
+             Sifr.from_fraction(Fraction(-1, 8), s), Sifr('-0.125', s))
+known_tester("FROM FRACTION (rounded)", Sifr.from_fraction(Fraction(2, 3), s),
+             Sifr('0.' + '6'*39 + '7', s))
+known_tester("FROM FLOAT", Sifr.from_float(0.5, s), Sifr('0.5', s))
+known_tester("FROM FLOAT (exact binary value)", Sifr.from_float(0.1, s),
+             Sifr('0.1000000000000000055511151231257827021182', s))
+raises_tester("FROM FLOAT (infinity)", Sifr.from_float, float('inf'), s)
+known_tester("FROM FLOAT (ints)",
+             [Sifr.from_float(3, s), Sifr.from_float(-10**30, s)],
+             [s.from_int(3), s.from_int(-10**30)])
+for num in number_link:
+    known_tester("FROM DECIMAL (" + str(num) + ")",
+                 Sifr.from_decimal(num, s), number_link[num])
+    known_tester("TO DECIMAL (" + str(num) + ")",
+                 number_link[num].to_decimal(), num)
+    known_tester("TO FRACTION (" + str(num) + ")",
+                 number_link[num].to_fraction(), Fraction(num))
+known_tester("TO INT (truncated)", [int(Sifr(n, s)) for n in
+                                    ('219.8459', '-31.26001234', '0.96')],
+             [219, -31, 0])
+
+# SifrArrays give the same results as the Sifrs one by one, with NumPy (if
+# installed) and with plain lists
+array_nums = list(number_link.values())
+array_divisors = [num for num in array_nums[1:] + array_nums[:1]
+                  if num != a]
+array_nums = array_nums[:len(array_divisors)]
+array_ops = {'add': (lambda x, y: x + y),
+             'sub': (lambda x, y: x - y),
+             'mul': (lambda x, y: x * y),
+             'truediv': (lambda x, y: x / y),
+             'lt': (lambda x, y: x < y),
+             'eq': (lambda x, y: x == y)}
+array_backends = [('list', None)]
+if sifr_arrays.np is not None:
+    array_backends.insert(0, ('NumPy', sifr_arrays.np))
+for backend, module in array_backends:
+    installed_np, sifr_arrays.np = sifr_arrays.np, module
+    arr1 = SifrArray(array_nums, s)
+    arr2 = SifrArray(array_divisors, s)
+    for name, op in array_ops.items():
+        known_tester("ARRAY " + name + " (" + backend + ")",
+                     [str(res) for res in op(arr1, arr2)],
+                     [str(op(x, y)) for x, y in zip(array_nums,
+                                                    array_divisors)])
+    two = s.from_int(2)
+    for name, calc, ans in (
+            ("int * array", 2 * arr1, [two * x for x in array_nums]),
+            ("int + array", 2 + arr1, [two + x for x in array_nums]),
+            ("int - array", 2 - arr1, [two - x for x in array_nums]),
+            ("int / array", 2 / arr2, [two / x for x in array_divisors]),
+            ("array / Sifr", arr1 / h, [x / h for x in array_nums]),
+            ("Sifr / array", h / arr2, [h / x for x in array_divisors]),
+            ("array + Sifr", arr1 + h, [x + h for x in array_nums]),
+            ("Sifr + array", h + arr1, [h + x for x in array_nums]),
+            ("array - Sifr", arr1 - h, [x - h for x in array_nums]),
+            ("Sifr - array", h - arr1, [h - x for x in array_nums]),
+            ("array * Sifr", arr1 * h, [x * h for x in array_nums]),
+            ("Sifr * array", h * arr1, [h * x for x in array_nums]),
+            ("sum", [arr1.sum()], [sum(array_nums[1:], array_nums[0])]),
+            ("prod", [arr2.prod()],
+             [functools.reduce(lambda x, y: x * y, array_divisors)])):
+        known_tester("ARRAY " + name + " (" + backend + ")",
+                     [res.sifr for res in calc], [res.sifr for res in ans])
+    sifr_arrays.np = installed_np
+
+# Constants cached on disk
+cache_dir = tempfile.mkdtemp()
+e_sys = SifrSystem(xcimal_places=50)
+e_ans = Constants(e_sys, cache=None).return_e()
+e_num = (e_ans.is_neg, e_ans._mant, e_ans._exp)
+ConstantCache(path=cache_dir).put('e', e_sys.digit_list, 50, e_num)
+e_cache = ConstantCache(path=cache_dir)
+known_tester("CONSTANT CACHE (disk round trip)",
+             e_cache.get('e', e_sys.digit_list, 50), e_num)
+e_cache = ConstantCache(path=cache_dir)
+known_tester("CONSTANT CACHE (lower precision served from a higher one)",
+             e_cache.get('e', e_sys.digit_list, 20), e_num)
+known_tester("CONSTANT CACHE (held under the precision of the file)",
+             list(e_cache._entries), [('e', e_sys.digit_list, 50)])
+e_file = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+for content in (b'', b'SIFR', b'not a cache file at all'):
+    with open(e_file, 'wb') as corrupt_file:
+        corrupt_file.write(content)
+    known_tester("CONSTANT CACHE (corrupt file " + repr(content) +
+                 " is a miss and removed)",
+                 [ConstantCache(path=cache_dir).get('e', e_sys.digit_list,
+                                                    50),
+                  os.listdir(cache_dir)], [None, []])
+known_tester("CONSTANT CACHE (worked out again after a corrupt file)",
+             [Constants(e_sys, cache=ConstantCache(path=cache_dir)).return_e(),
+              Constants(e_sys, cache=ConstantCache(path=cache_dir)).return_e(),
+              len(os.listdir(cache_dir))], [e_ans, e_ans, 1])
+shutil.rmtree(cache_dir)
+warm_cache = ConstantCache()
+Constants(e_sys, cache=warm_cache).return_e()
+known_tester("CONSTANT CACHE (higher precision rounded without guard digits)",
+             Constants(SifrSystem(xcimal_places=10), guard_digits=0,
+                       cache=warm_cache).return_e().sifr, '2.7182818285')
+
+# Roots
+known_tester("SQRT (exact)", Sifr('152.2756', s).sqrt(), Sifr('12.34', s))
+known_tester("SQRT (exact, hexadecimal)", Sifr('A9', hex_sys).sqrt().sifr,
+             'D.0')
+known_tester("SQRT (inexact)", Sifr('2', s).sqrt(),
+             Sifr('1.4142135623730950488016887242096980785697', s))
+known_tester("ROOT (exact cube root of a negative)",
+             Sifr('-15.625', s).root(3), Sifr('-2.5', s))
+known_tester("ROOT (inexact cube root)", Sifr('10', s).root(Sifr('3', s)),
+             Sifr('2.1544346900318837217592935665193504952593', s))
+known_tester("ROOT (negative n gives the reciprocal)", Sifr('2', s).root(-5),
+             Sifr('0.8705505632961241391362700174797460989791', s))
+known_tester("SQRT (zero)", Sifr('0', s).sqrt(), Sifr('0', s))
+raises_tester("SQRT (negative number)", Sifr('-4', s).sqrt)
+raises_tester("ROOT (even root of a negative number)", Sifr('-16', s).root, 4)
+raises_tester("ROOT (not a whole number)", Sifr('16', s).root, Sifr('2.5', s))
+raises_tester("ROOT (zeroth root)", Sifr('16', s).root, 0)
+
+# Elementary functions (known values rounded to the places of the system)
+fn_sys = SifrSystem(xcimal_places=30)
+fn_hex = SifrSystem('0123456789ABCDEF', xcimal_places=20)
+function_answers = (
+    (functions.exp, '1', '2.718281828459045235360287471353'),
+    (functions.exp, '-2.5', '0.082084998623898795169528674467'),
+    (functions.ln, '2', '0.693147180559945309417232121458'),
+    (functions.ln, '0.001', '-6.907755278982137052053974364053'),
+    (functions.log, '1000', '3.0'),
+    (functions.sin, '1', '0.84147098480789650665250232163'),
+    (functions.cos, '1', '0.540302305868139717400936607443'),
+    (functions.sin, '1000000', '-0.349993502171292952117652486781'),
+    (functions.cos, '-1000000', '0.936752127533144786938532535075'),
+    (functions.sin, '12345678901234567890.5',
+     '0.863709195443936090419677676004'),
+    (functions.cos, '12345678901234567890.5',
+     '0.503990501602548664765610154635'),
+    (functions.atan, '1', '0.78539816339744830961566084582'),
+    (functions.atan, '-50', '-1.550798992821746086170568494738'))
+for func, arg, ans in function_answers:
+    known_tester("FUNCTION " + func.__name__ + "(" + arg + ")",
+                 func(Sifr(arg, fn_sys)).sifr, ans)
+known_tester("FUNCTION log(10) to base 2",
+             functions.log(Sifr('10', fn_sys), 2).sifr,
+             '3.321928094887362347870319429489')
+hex_answers = (
+    (functions.exp, '1', '2.B7E151628AED2A6ABF71'),
+    (functions.ln, '2', '0.B17217F7D1CF79ABC9E4'),
+    (functions.log, '100', '2.0'),
+    (functions.sin, '1', '0.D76AA47848677020C6EA'),
+    (functions.cos, '10000', '-0.B8CA298849445BE6B4B8'))
+for func, arg, ans in hex_answers:
+    known_tester("FUNCTION " + func.__name__ + "(" + arg + ") in hexadecimal",
+                 func(Sifr(arg, fn_hex)).sifr, ans)
+raises_tester("FUNCTION ln(0)", functions.ln, Sifr('0', fn_sys))
+raises_tester("FUNCTION ln(-1)", functions.ln, Sifr('-1', fn_sys))
+raises_tester("FUNCTION log(-5)", functions.log, Sifr('-5', fn_sys))
+raises_tester("FUNCTION log(5) to base 1", functions.log, Sifr('5', fn_sys),
+              1)
+raises_tester("FUNCTION log(5) to base 0", functions.log, Sifr('5', fn_sys),
+              0)
+
+# Formulae
+for n in (0, 1, 2, 12, 25, 100, 1000):
+    known_tester("FACTORIAL (" + str(n) + ")",
+                 int(Formulae.factorial(s.from_int(n))), math.factorial(n))
+for n, ans in ((-1, 1), (0, 1), (9, 945), (10, 3840)):
+    known_tester("DOUBLE FACTORIAL (" + str(n) + ")",
+                 int(Formulae.double_factorial(s.from_int(n))), ans)
+for n, k in ((10, 3), (10, 0), (0, 0), (10, 10), (52, 5), (3, 5), (5, -1),
+             (200, 100)):
+    ans = math.factorial(n) // (math.factorial(k) * math.factorial(n - k)) \
+        if 0 <= k <= n else 0
+    known_tester("BINOMIAL (" + str(n) + ", " + str(k) + ")",
+                 int(Formulae.binomial(s.from_int(n), s.from_int(k))), ans)
+raises_tester("FACTORIAL (negative number)", Formulae.factorial,
+              s.from_int(-3))
+raises_tester("FACTORIAL (not a whole number)", Formulae.factorial,
+              Sifr('2.5', s))
+
+# Memo (shared with the working systems Constants are worked out in, made
+# before or after it is switched on)
+memo_sys = SifrSystem(xcimal_places=30)
+memo_work = Constants(memo_sys, cache=None).wsys
+memo_deep = memo_work.with_xcimal_places(40)
+memo = memo_sys.enable_memo()
+memo_phi = Constants(memo_sys, cache=None).return_fibonacci_phi()
+known_tester("MEMO (first Constants call misses)",
+             (memo.stats()['hits'], memo.stats()['misses']), (0, 2))
+known_tester("MEMO (repeated Constants call hits)",
+             (Constants(memo_sys, cache=None).return_fibonacci_phi(),
+              memo.stats()['hits'], memo.stats()['misses']),
+             (memo_phi, 2, 2))
+memo_fibs = [Formulae.fibonacci(system.from_int(34))
+             for system in (memo_sys, memo_work, memo_deep, memo_sys)]
+known_tester("MEMO (formulae keyed by system)",
+             ([fib.ssys.xcimal_places for fib in memo_fibs],
+              memo_fibs[0] is memo_fibs[3], memo.stats()['hits'],
+              memo.stats()['misses']),
+             ([30, 34, 40, 30], True, 3, 5))
+memo_sys.disable_memo()
+Constants(memo_sys, cache=None).return_fibonacci_phi()
+Formulae.fibonacci(memo_work.from_int(35))
+Formulae.fibonacci(memo_deep.from_int(35))
+known_tester("MEMO (switched off in the working systems)",
+             (memo.stats()['hits'], memo.stats()['misses']), (3, 5))
+with memo_sys.profile() as prof:
+    memo_deep._num_truncate(123456, 2, 1)
+known_tester("PROFILE (reaches a system made from a working system)",
+             prof.calls['_num_truncate'], 1)
+
+# Series summed over worker processes give the same sums as summed serially
+par_sys = SifrSystem(xcimal_places=30)
+par_leibniz = Xuarizm(LeibnizTerm(par_sys), par_sys,
+                      upper_bound=par_sys.from_int(200))
+known_tester("PARALLEL (arith_series over 2 processes)",
+             par_leibniz.arith_series(2), par_leibniz.arith_series())
+for par_method in ('return_bbp_pi', 'return_e'):
+    known_tester("PARALLEL (binary_split_series " + par_method +
+                 " over 2 processes)",
+                 getattr(Constants(par_sys, cache=None, parallel=2),
+                         par_method)(),
+                 getattr(Constants(par_sys, cache=None), par_method)())
+    known_tester("PARALLEL (binary_split_series " + par_method +
+                 " over 3 processes to 40 terms)",
+                 getattr(Constants(par_sys, cache=None, parallel=3),
+                         par_method)(par_sys.from_int(40)),
+                 getattr(Constants(par_sys, cache=None),
+                         par_method)(par_sys.from_int(40)))
+
+# Profiling counts the calls of each primitive and the digits given to it
+prof_sys = SifrSystem(xcimal_places=10)
+prof_tables = (prof_sys.ROUNDING_FUNCTIONS, prof_sys.NUM_ROUNDING_FUNCTIONS)
+with prof_sys.profile() as prof:
+    prof_sys.round('1.55', 1)
+known_tester("PROFILE (round_half_to_inf through round)",
+             (prof.calls['round_half_to_inf'],
+              prof.digits['round_half_to_inf']), (1, 4))
+with prof_sys.profile() as prof:
+    Sifr('1.5', prof_sys) * Sifr('2.25', prof_sys)
+known_tester("PROFILE (_num_mul of two Sifrs)",
+             (prof.calls['_num_mul'], prof.digits['_num_mul']), (1, 5))
+with prof_sys.profile() as prof:
+    prof_sys._num_truncate(123456, 2, 3)
+known_tester("PROFILE (xcimal places not counted as digits)",
+             (prof.calls['_num_truncate'], prof.digits['_num_truncate']),
+             (1, 6))
+known_tester("PROFILE (primitives taken off the system after)",
+             [name for name in PRIMITIVES if name in vars(prof_sys)], [])
+known_tester("PROFILE (rounding tables put back after)",
+             (prof_sys.ROUNDING_FUNCTIONS is prof_tables[0],
+              prof_sys.NUM_ROUNDING_FUNCTIONS is prof_tables[1]),
+             (True, True))
+
+# Constants are rounded once, so a carry in the guard digits doesn't reach
+# the last place (pi is 10.0102110|12222 0... in base 3 and e is
+# 10.1011|0111... in binary)
+ternary_sys = SifrSystem('012', xcimal_places=7)
+for once_method in ('return_bbp_pi', 'return_chudnovsky_pi', 'return_agm_pi',
+                    'return_pi'):
+    known_tester("ROUNDED ONCE (" + once_method + " in base 3)",
+                 getattr(Constants(ternary_sys, cache=None),
+                         once_method)().sifr, '10.010211')
+known_tester("ROUNDED ONCE (return_e in binary)",
+             Constants(SifrSystem('01', xcimal_places=4),
+                       cache=None).return_e().sifr, '10.1011')
+for phi_places in (201, 203, 209):
+    phi_sys = SifrSystem(xcimal_places=phi_places)
+    known_tester("ROUNDED ONCE (return_arith_phi to " + str(phi_places) +
+                 " places with one guard digit)",
+                 Constants(phi_sys, guard_digits=1,
+                           cache=None).return_arith_phi(),
+                 Constants(phi_sys, cache=None).return_phi())
+
+# Ints are taken into the system of the Sifr they are used with
+known_tester("SIFR with int operands",
+             [(h + 2).sifr, (h - 20).sifr, (h * 3).sifr, (h / 4).sifr,
+              (h // 4).sifr, (h % 4).sifr, (h ** 2).sifr, h == 13, h < 14],
+             ['15.0', '-7.0', '39.0', '3.25', '3.0', '1.0', '169.0', True,
+              True])
+
+# Exponentiation by squaring and modular exponentiation (three argument pow,
+# following the signs of Python's pow)
+known_tester("POW (1.5 ** 10)", (Sifr('1.5', s) ** s.from_int(10)).sifr,
+             '57.6650390625')
+known_tester("POW (-2 ** -3)", (s.from_int(-2) ** s.from_int(-3)).sifr,
+             '-0.125')
+known_tester("POW (hexadecimal 0.8 ** 9)",
+             (Sifr('0.8', hex_sys) ** hex_sys.from_int(9)).sifr, '0.008')
+for mod_args, ans in (((3, 200, 1000007), 959082), ((3, -1, 7), 5),
+                      ((-3, 3, 7), 1), ((3, 3, -7), -1), ((3, -2, -7), -3),
+                      ((12345678901234567890, 65537, 2**127 - 1),
+                       pow(12345678901234567890, 65537, 2**127 - 1)),
+                      ((5, 0, 13), 1)):
+    known_tester("MODULAR POW " + str(mod_args),
+                 pow(*[s.from_int(arg) for arg in mod_args]),
+                 s.from_int(ans))
+raises_tester("MODULAR POW (base not invertible)", pow, s.from_int(2),
+              s.from_int(-1), s.from_int(4))
+raises_tester("MODULAR POW (zero modulus)", pow, s.from_int(2),
+              s.from_int(3), s.from_int(0))
+raises_tester("MODULAR POW (not a whole number)", pow, Sifr('2.5', s),
+              s.from_int(2), s.from_int(7))
+
+# Tracing goes to the 'sifr' logger only from systems with trace=True (and
+# not from calls masked by mask_logging)
+class TraceCollector(logging.Handler):
+    '''Keeps the messages logged to it'''
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+trace_logger = logging.getLogger('sifr')
+trace_handler = TraceCollector()
+trace_level, trace_propagate = trace_logger.level, trace_logger.propagate
+trace_logger.addHandler(trace_handler)
+trace_logger.setLevel(logging.DEBUG)
+trace_logger.propagate = False
+trace_sys = SifrSystem(xcimal_places=10, trace=True)
+trace_handler.messages = []
+Sifr('1.5', trace_sys) + Sifr('2', trace_sys)
+known_tester("TRACE (add traced with trace=True)",
+             [message for message in trace_handler.messages
+              if message.startswith('###')],
+             ['### START MAIN ADD', '### END MAIN ADD'])
+trace_handler.messages = []
+mask_logging(lambda x, y: x * y)(Sifr('1.5', trace_sys),
+                                 Sifr('2', trace_sys))
+known_tester("TRACE (nothing traced under mask_logging)",
+             trace_handler.messages, [])
+quiet_sys = SifrSystem(xcimal_places=10)
+Sifr('1.5', quiet_sys) + Sifr('2', quiet_sys)
+Constants(quiet_sys, cache=None).return_e()
+known_tester("TRACE (nothing traced with trace=False)",
+             trace_handler.messages, [])
+trace_logger.removeHandler(trace_handler)
+trace_logger.setLevel(trace_level)
+trace_logger.propagate = trace_propagate
+
+# Interned constants are the same Sifr on every call
+intern_sys = SifrSystem(xcimal_places=10)
+known_tester("INTERNED (from_small gives the same Sifr)",
+             (intern_sys.from_small(7) is intern_sys.from_small(7),
+              intern_sys.from_int(-256) is intern_sys.from_small(-256),
+              intern_sys.zero is intern_sys.from_int(0),
+              intern_sys.one is intern_sys.from_int(1),
+              intern_sys.from_small(7).sifr),
+             (True, True, True, True, '7.0'))
+known_tester("INTERNED (from_int past small_int_bound is not interned)",
+             (intern_sys.from_int(257) is intern_sys.from_int(257),
+              intern_sys.from_int(257).sifr), (False, '257.0'))
+raises_tester("INTERNED (from_small past small_int_bound)",
+              intern_sys.from_small, 257)
+known_tester("INTERNED (base_power gives the same Sifr)",
+             (intern_sys.base_power(3) is intern_sys.base_power(3),
+              intern_sys.base_power(-2) is intern_sys.base_power(-2),
+              intern_sys.base_power(3).sifr, intern_sys.base_power(-2).sifr,
+              intern_sys.base_power().sifr),
+             (True, True, '1000.0', '0.01', '10.0'))
+known_tester("INTERNED (base_power in hexadecimal)",
+             (hex_sys.base_power(2).sifr, hex_sys.base_power(-1).sifr),
+             ('100.0', '0.1'))
+
+# Series from a recurrence between terms and from an iterable of terms
+series_sys = SifrSystem(xcimal_places=40)
+series_two = series_sys.from_int(2)
+known_tester("RECURRENCE SERIES (2^-k for k = 0 to 10)",
+             Xuarizm(None, series_sys, upper_bound=series_sys.from_int(10)
+                     ).recurrence_series(series_sys.one,
+                                         lambda prev, k: prev / series_two
+                                         ).sifr, '1.9990234375')
+known_tester("RECURRENCE SERIES (k! for k = 0 to 5)",
+             Xuarizm(None, series_sys, upper_bound=series_sys.from_int(5)
+                     ).recurrence_series(series_sys.one,
+                                         lambda prev, k: prev * k).sifr,
+             '154.0')
+known_tester("RECURRENCE SERIES (1/k! until the terms are zero)",
+             Xuarizm(None, series_sys).recurrence_series(
+                 series_sys.one, lambda prev, k: prev / k).round(30),
+             Constants(series_sys, cache=None).return_e().round(30))
+known_tester("TERM SERIES (until the terms run out)",
+             Xuarizm(None, series_sys).term_series(
+                 series_sys.from_int(k) for k in range(1, 101)).sifr,
+             '5050.0')
+known_tester("TERM SERIES (stops at the first zero term)",
+             Xuarizm(None, series_sys).term_series(
+                 iter([series_two, series_sys.zero, series_two])).sifr, '2.0')
+
+# Fibonacci numbers by fast doubling (F(-n) = (-1)^(n+1) F(n))
+fib_known = [0, 1]
+while len(fib_known) <= 1000:
+    fib_known.append(fib_known[-1] + fib_known[-2])
+for n in (0, 1, 2, 10, 93, 100, 1000, -1, -2, -10, -93):
+    fib_ans = fib_known[abs(n)]
+    if n < 0 and n % 2 == 0:
+        fib_ans = -fib_ans
+    known_tester("FIBONACCI (" + str(n) + ")",
+                 int(Formulae.fibonacci(s.from_int(n))), fib_ans)
+known_tester("FIBONACCI (100) in hexadecimal",
+             Formulae.fibonacci(hex_sys.from_int(100)).sifr,
+             hex(fib_known[100])[2:].upper() + '.0')
+raises_tester("FIBONACCI (not a whole number)", Formulae.fibonacci,
+              Sifr('2.5', s))